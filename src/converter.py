@@ -10,12 +10,18 @@ Buchungsmodell:
 
 import logging
 import re
-from collections import defaultdict
-from datetime import date
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import MAXYEAR, date
 from decimal import Decimal
+from functools import lru_cache
+from itertools import islice
+from operator import attrgetter
 
 from src.exceptions import ConversionError
 from src.models import (
+    ACCOUNT_TYPE_ASSET,
     ACCOUNT_TYPE_BANK,
     ACCOUNT_TYPE_CASH,
     ACCOUNT_TYPE_CREDITCARD,
@@ -39,12 +45,42 @@ logger = logging.getLogger(__name__)
 # Konten ohne Payee-Buchung (interne Überweisungen erhalten keinen Kreditoren-Eintrag)
 _INTERNAL_TRANSFER_PAYMODE = 5
 
+# Neutraler Saldo; Transaktionen auf unbekannte Konten starten hier, daher
+# bleibt der get()-Default nötig — aber ohne Decimal-Allokation pro Aufruf
+_ZERO = Decimal(0)
+
+# Zwei oder mehr aufeinanderfolgende Leerzeichen (hledger-Feldtrenner)
+_MULTI_SPACE_RE = re.compile(r" {2,}")
+
+# Gegenkonten für Buchungen ohne (bekannte) Kategorie
+_UNCATEGORIZED_INCOME = "Erträge:Nicht kategorisiert"
+_UNCATEGORIZED_EXPENSE = "Aufwand:Nicht kategorisiert"
+
+# Feste Hauptkonten, die jedes Jahresjournal deklariert
+_STATIC_ACCOUNT_DECLARATIONS = (
+    "account Aktiva                                  ; type: A",
+    "account Aktiva:Bank                             ; type: C",
+    "account Aktiva:Kasse                            ; type: C",
+    "account Aktiva:Vermögen                         ; type: A",
+    "account Aktiva:Spareinlagen                     ; type: A",
+    "account Aktiva:Debitoren                        ; type: A",
+    "account Passiva                                 ; type: L",
+    "account Passiva:Kreditkarte                     ; type: L",
+    "account Passiva:Darlehen                        ; type: L",
+    "account Passiva:Kreditoren                      ; type: L",
+    "account Eigenkapital                            ; type: E",
+    "account Eigenkapital:Eröffnungsbilanzkonto      ; type: E",
+    "account Erträge                                 ; type: R",
+    "account Aufwand                                 ; type: X",
+)
+
 
 # ---------------------------------------------------------------------------
 # Konto-Name-Mapping
 # ---------------------------------------------------------------------------
 
 
+@lru_cache(maxsize=8192)
 def _sanitize_account_name(name: str) -> str:
     """
     Bereinigt einen Kontonamen für hledger.
@@ -53,24 +89,43 @@ def _sanitize_account_name(name: str) -> str:
     - Normalisiert mehrfache Leerzeichen zu einem (hledger nutzt 2+ Leerzeichen
       als Trennzeichen zwischen Kontoname und Betrag in account-Direktiven)
     - Entfernt führende/nachfolgende Leerzeichen
+
+    Das Ergebnis wird gecacht, da dieselben Payee-, Konto- und Kategorienamen
+    bei jeder Transaktion erneut bereinigt werden.
     """
     sanitized = name.replace(":", "-")
-    sanitized = re.sub(r" {2,}", " ", sanitized)
+    # Regex nur anwerfen, wenn überhaupt ein Doppelleerzeichen vorkommt
+    if "  " in sanitized:
+        sanitized = _MULTI_SPACE_RE.sub(" ", sanitized)
     return sanitized.strip()
 
 
+# Homebank-Kontotyp → hledger-Kontopräfix
+_ACCOUNT_PREFIX: dict[int, str] = {
+    ACCOUNT_TYPE_NONE: "Aktiva",
+    ACCOUNT_TYPE_BANK: "Aktiva:Bank",
+    ACCOUNT_TYPE_CASH: "Aktiva:Kasse",
+    ACCOUNT_TYPE_ASSET: "Aktiva:Vermögen",
+    ACCOUNT_TYPE_CREDITCARD: "Passiva:Kreditkarte",
+    ACCOUNT_TYPE_LIABILITY: "Passiva:Darlehen",
+    ACCOUNT_TYPE_SAVINGS: "Aktiva:Spareinlagen",
+}
+
+# Homebank-Kontotyp → hledger-Typ-Tag
+_ACCOUNT_TYPE_TAG: dict[int, str] = {
+    ACCOUNT_TYPE_NONE: "A",
+    ACCOUNT_TYPE_BANK: "C",
+    ACCOUNT_TYPE_CASH: "C",
+    ACCOUNT_TYPE_ASSET: "A",
+    ACCOUNT_TYPE_CREDITCARD: "L",
+    ACCOUNT_TYPE_LIABILITY: "L",
+    ACCOUNT_TYPE_SAVINGS: "A",
+}
+
+
 def _account_prefix(account_type: int) -> str:
     """Gibt den hledger-Kontopräfix für einen Homebank-Kontotyp zurück."""
-    mapping = {
-        ACCOUNT_TYPE_NONE: "Aktiva",
-        ACCOUNT_TYPE_BANK: "Aktiva:Bank",
-        ACCOUNT_TYPE_CASH: "Aktiva:Kasse",
-        3: "Aktiva:Vermögen",  # ACCOUNT_TYPE_ASSET
-        ACCOUNT_TYPE_CREDITCARD: "Passiva:Kreditkarte",
-        ACCOUNT_TYPE_LIABILITY: "Passiva:Darlehen",
-        ACCOUNT_TYPE_SAVINGS: "Aktiva:Spareinlagen",
-    }
-    return mapping.get(account_type, "Aktiva")
+    return _ACCOUNT_PREFIX.get(account_type, "Aktiva")
 
 
 def hledger_account_name(account: Account) -> str:
@@ -82,16 +137,7 @@ def hledger_account_name(account: Account) -> str:
 
 def hledger_account_type_tag(account_type: int) -> str:
     """Gibt das hledger-Typ-Tag für einen Kontotyp zurück."""
-    mapping = {
-        ACCOUNT_TYPE_NONE: "A",
-        ACCOUNT_TYPE_BANK: "C",
-        ACCOUNT_TYPE_CASH: "C",
-        3: "A",  # ACCOUNT_TYPE_ASSET
-        ACCOUNT_TYPE_CREDITCARD: "L",
-        ACCOUNT_TYPE_LIABILITY: "L",
-        ACCOUNT_TYPE_SAVINGS: "A",
-    }
-    return mapping.get(account_type, "A")
+    return _ACCOUNT_TYPE_TAG.get(account_type, "A")
 
 
 def _category_path(cat_key: int, categories: dict[int, Category]) -> str:
@@ -111,28 +157,21 @@ def _category_path(cat_key: int, categories: dict[int, Category]) -> str:
 def _category_account(
     cat_key: int | None,
     amount: Decimal,
-    categories: dict[int, Category],
+    category_accounts: dict[int, str],
 ) -> str:
-    """Gibt den hledger-Kontonamen für eine Kategorie zurück."""
-    if cat_key is None:
-        # Vorzeichen bestimmt Einnahme/Ausgabe
-        return (
-            "Erträge:Nicht kategorisiert"
-            if amount >= 0
-            else "Aufwand:Nicht kategorisiert"
-        )
-
-    cat = categories.get(cat_key)
-    if cat is None:
-        return (
-            "Erträge:Nicht kategorisiert"
-            if amount >= 0
-            else "Aufwand:Nicht kategorisiert"
-        )
+    """
+    Gibt den hledger-Kontonamen für eine Kategorie zurück.
 
-    path = _category_path(cat_key, categories)
-    prefix = "Erträge" if cat.is_income else "Aufwand"
-    return f"{prefix}:{path}"
+    category_accounts enthält die vorberechneten Kontonamen aller bekannten
+    Kategorien (siehe _build_name_tables). Deren Präfix folgt dem
+    Einnahme-Flag der Kategorie; nur ohne bekannte Kategorie entscheidet das
+    Vorzeichen des Betrags.
+    """
+    if cat_key is not None:
+        acc_name = category_accounts.get(cat_key)
+        if acc_name is not None:
+            return acc_name
+    return _UNCATEGORIZED_INCOME if amount >= 0 else _UNCATEGORIZED_EXPENSE
 
 
 def _payee_account(payee_name: str, amount: Decimal) -> str:
@@ -148,18 +187,60 @@ def _payee_account(payee_name: str, amount: Decimal) -> str:
     return f"Aktiva:Debitoren:{safe_name}"
 
 
+# ---------------------------------------------------------------------------
+# Vorberechnete Namenstabellen
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class _NameTables:
+    """Einmal pro convert()-Aufruf vorberechnete Kontonamen und Sortierungen."""
+
+    accounts: dict[int, str]  # Konto-Key → hledger-Kontoname
+    categories: dict[int, str]  # Kategorie-Key → Erträge:/Aufwand:-Kontoname
+    currencies: dict[int, str]  # Konto-Key → ISO-Code der Kontowährung
+    payees: dict[int, str]  # Payee-Key → Name des Zahlungsempfängers
+    account_keys: tuple[int, ...]  # Konto-Keys aufsteigend (Eröffnungsbuchung)
+    # Nach Name sortiert, in Deklarationsreihenfolge (für jedes Jahr identisch)
+    sorted_accounts: tuple[Account, ...]
+    sorted_payees: tuple[Payee, ...]
+    sorted_categories: tuple[Category, ...]
+
+
+def _build_name_tables(hb: HomebankFile, base_iso: str) -> _NameTables:
+    """Berechnet die hledger-Namen aller Konten und Kategorien einmalig."""
+    accounts = {key: hledger_account_name(acc) for key, acc in hb.accounts.items()}
+    categories: dict[int, str] = {}
+    for key, cat in hb.categories.items():
+        prefix = "Erträge" if cat.is_income else "Aufwand"
+        categories[key] = f"{prefix}:{_category_path(key, hb.categories)}"
+    currencies: dict[int, str] = {}
+    for key, acc in hb.accounts.items():
+        currency = hb.currencies.get(acc.currency_key)
+        currencies[key] = currency.iso if currency else base_iso
+    payees = {key: payee.name for key, payee in hb.payees.items()}
+    return _NameTables(
+        accounts=accounts,
+        categories=categories,
+        currencies=currencies,
+        payees=payees,
+        account_keys=tuple(sorted(hb.accounts)),
+        sorted_accounts=tuple(sorted(hb.accounts.values(), key=lambda a: a.name)),
+        sorted_payees=tuple(sorted(hb.payees.values(), key=lambda p: p.name)),
+        sorted_categories=tuple(sorted(hb.categories.values(), key=lambda c: c.name)),
+    )
+
+
 # ---------------------------------------------------------------------------
 # Transaktions-Status → hledger-Markierung
 # ---------------------------------------------------------------------------
 
 
-def _status_mark(status: int) -> str:
-    """Gibt die hledger-Statusmarkierung zurück."""
-    if status == TXN_STATUS_RECONCILED:
-        return "*"
-    if status == TXN_STATUS_CLEARED:
-        return "!"
-    return ""
+# Homebank-Status → hledger-Markierung (alle übrigen: keine Markierung)
+_STATUS_MARK: dict[int, str] = {
+    TXN_STATUS_RECONCILED: "*",
+    TXN_STATUS_CLEARED: "!",
+}
 
 
 # ---------------------------------------------------------------------------
@@ -167,7 +248,9 @@ def _status_mark(status: int) -> str:
 # ---------------------------------------------------------------------------
 
 
-def _build_description(txn: Transaction, payees: dict[int, Payee]) -> tuple[str, str]:
+def _build_description(
+    txn: Transaction, payee_names: dict[int, str]
+) -> tuple[str, str]:
     """
     Erstellt Payee- und Notiz-Teil der Transaktionsbeschreibung.
 
@@ -176,16 +259,16 @@ def _build_description(txn: Transaction, payees: dict[int, Payee]) -> tuple[str,
     """
     payee_name = ""
     if txn.payee_key is not None:
-        p = payees.get(txn.payee_key)
-        if p:
-            payee_name = p.name
-
-    parts: list[str] = []
-    if txn.wording:
-        parts.append(txn.wording)
-    if txn.info:
-        parts.append(txn.info)
-    note = " – ".join(parts) if parts else ""
+        payee_name = payee_names.get(txn.payee_key, "")
+
+    # Häufigster Fall: höchstens eines der beiden Felder ist gesetzt
+    wording, info = txn.wording, txn.info
+    if not info:
+        note = wording
+    elif not wording:
+        note = info
+    else:
+        note = f"{wording} – {info}"
 
     return payee_name, note
 
@@ -197,62 +280,41 @@ def _build_description(txn: Transaction, payees: dict[int, Payee]) -> tuple[str,
 
 def _convert_normal_transaction(
     txn: Transaction,
-    hb: HomebankFile,
     currency_iso: str,
+    names: _NameTables,
 ) -> HledgerTransaction:
     """Konvertiert eine einfache (nicht-split, nicht-intern) Transaktion."""
-    account = hb.accounts.get(txn.account_key)
-    if account is None:
+    acc_name = names.accounts.get(txn.account_key)
+    if acc_name is None:
         raise ConversionError(
             f"Konto {txn.account_key} nicht gefunden für Transaktion am {txn.date}"
         )
 
-    payee_name, note = _build_description(txn, hb.payees)
-    status = _status_mark(txn.status)
-    acc_name = hledger_account_name(account)
-    cat_acc = _category_account(txn.category_key, txn.amount, hb.categories)
+    payee_name, note = _build_description(txn, names.payees)
+    status = _STATUS_MARK.get(txn.status, "")
+    cat_acc = _category_account(txn.category_key, txn.amount, names.categories)
     amount = txn.amount
 
-    # Buchungsrichtung:
-    # Ausgabe (< 0): Aufwand +abs / Kreditoren -abs → Kreditoren +abs / Aktiva -abs
-    # Einnahme (amount > 0): Debitoren +amt / Erträge -amt → Aktiva +amt / Deb. -amt
+    # Buchungsrichtung (Beträge stets +abs / -abs / +abs / -abs):
+    # Ausgabe (< 0): Aufwand / Kreditoren → Kreditoren / Aktiva
+    # Einnahme (>= 0): Debitoren / Erträge → Aktiva / Debitoren
     postings_list: list[HledgerPosting] = []
     if payee_name:
         payee_acc = _payee_account(payee_name, amount)
+        # Betrag und Gegenbetrag nur einmal berechnen (Decimal-Operationen
+        # allozieren jeweils ein neues Objekt)
         abs_amount = abs(amount)
+        neg_amount = -abs_amount
 
         if amount < 0:
-            # Ausgabe
-            postings_list = [
-                HledgerPosting(
-                    account=cat_acc, amount=abs_amount, currency=currency_iso
-                ),
-                HledgerPosting(
-                    account=payee_acc, amount=-abs_amount, currency=currency_iso
-                ),
-                HledgerPosting(
-                    account=payee_acc, amount=abs_amount, currency=currency_iso
-                ),
-                HledgerPosting(
-                    account=acc_name, amount=-abs_amount, currency=currency_iso
-                ),
-            ]
+            order = (cat_acc, payee_acc, payee_acc, acc_name)
         else:
-            # Einnahme
-            postings_list = [
-                HledgerPosting(
-                    account=payee_acc, amount=abs_amount, currency=currency_iso
-                ),
-                HledgerPosting(
-                    account=cat_acc, amount=-abs_amount, currency=currency_iso
-                ),
-                HledgerPosting(
-                    account=acc_name, amount=abs_amount, currency=currency_iso
-                ),
-                HledgerPosting(
-                    account=payee_acc, amount=-abs_amount, currency=currency_iso
-                ),
-            ]
+            order = (payee_acc, cat_acc, acc_name, payee_acc)
+        values = (abs_amount, neg_amount, abs_amount, neg_amount)
+        postings_list = [
+            HledgerPosting(account=account, amount=value, currency=currency_iso)
+            for account, value in zip(order, values, strict=True)
+        ]
     else:
         # Kein Payee: direkte Buchung ohne Kreditoren/Debitoren-Zwischenkonto
         if amount < 0:
@@ -279,27 +341,25 @@ def _convert_normal_transaction(
 
 def _convert_internal_transfer(
     txn: Transaction,
-    hb: HomebankFile,
     currency_iso: str,
+    names: _NameTables,
 ) -> HledgerTransaction:
     """Konvertiert eine interne Überweisung (kxfer-Transaktion)."""
-    src_account = hb.accounts.get(txn.account_key)
-    if src_account is None:
+    src_name = names.accounts.get(txn.account_key)
+    if src_name is None:
         raise ConversionError(
             f"Quellkonto {txn.account_key} nicht gefunden "
             f"für interne Überweisung am {txn.date}"
         )
-    dst_account = hb.accounts.get(txn.dst_account_key)  # type: ignore[arg-type]
-    if dst_account is None:
+    dst_name = names.accounts.get(txn.dst_account_key)  # type: ignore[arg-type]
+    if dst_name is None:
         raise ConversionError(
             f"Zielkonto {txn.dst_account_key} nicht gefunden "
             f"für interne Überweisung am {txn.date}"
         )
 
-    payee_name, note = _build_description(txn, hb.payees)
-    status = _status_mark(txn.status)
-    src_name = hledger_account_name(src_account)
-    dst_name = hledger_account_name(dst_account)
+    payee_name, note = _build_description(txn, names.payees)
+    status = _STATUS_MARK.get(txn.status, "")
     amount = txn.amount
 
     postings = (
@@ -319,12 +379,12 @@ def _convert_internal_transfer(
 
 def _convert_split_transaction(
     txn: Transaction,
-    hb: HomebankFile,
     currency_iso: str,
+    names: _NameTables,
 ) -> HledgerTransaction:
     """Konvertiert eine Splittransaktion (mehrere Kategorien)."""
-    account = hb.accounts.get(txn.account_key)
-    if account is None:
+    acc_name = names.accounts.get(txn.account_key)
+    if acc_name is None:
         raise ConversionError(
             f"Konto {txn.account_key} nicht gefunden für Splittransaktion am {txn.date}"
         )
@@ -333,88 +393,58 @@ def _convert_split_transaction(
             f"Splittransaktion am {txn.date} hat keine Split-Einträge"
         )
 
-    payee_name, note = _build_description(txn, hb.payees)
-    status = _status_mark(txn.status)
-    acc_name = hledger_account_name(account)
+    payee_name, note = _build_description(txn, names.payees)
+    status = _STATUS_MARK.get(txn.status, "")
     total_amount = txn.amount
 
     postings_list: list[HledgerPosting] = []
 
     if payee_name:
         payee_acc = _payee_account(payee_name, total_amount)
+        is_expense = total_amount < 0
         abs_total = abs(total_amount)
+        neg_total = -abs_total
 
         # Schritt 1: Aufwand/Ertrag ↔ Kreditoren/Debitoren für jeden Split
+        # (Ausgabe: Aufwand an Kreditoren, Einnahme: Debitoren an Erträge)
         for split in txn.splits:
             split_abs = abs(split.amount)
-            cat_acc = _category_account(split.category_key, split.amount, hb.categories)
-            comment = split.memo if split.memo else ""
-
-            if total_amount < 0:
-                # Ausgabe
-                postings_list.append(
-                    HledgerPosting(
-                        account=cat_acc,
-                        amount=split_abs,
-                        currency=currency_iso,
-                        comment=comment,
-                    )
-                )
-                postings_list.append(
-                    HledgerPosting(
-                        account=payee_acc, amount=-split_abs, currency=currency_iso
-                    )
-                )
-            else:
-                # Einnahme
-                postings_list.append(
-                    HledgerPosting(
-                        account=payee_acc,
-                        amount=split_abs,
-                        currency=currency_iso,
-                        comment=comment,
-                    )
-                )
-                postings_list.append(
-                    HledgerPosting(
-                        account=cat_acc, amount=-split_abs, currency=currency_iso
-                    )
-                )
-
-        # Schritt 2: Kreditoren/Debitoren ↔ Konto
-        if total_amount < 0:
-            postings_list.append(
-                HledgerPosting(
-                    account=payee_acc, amount=abs_total, currency=currency_iso
-                )
-            )
-            postings_list.append(
-                HledgerPosting(
-                    account=acc_name, amount=-abs_total, currency=currency_iso
-                )
+            split_neg = -split_abs
+            cat_acc = _category_account(
+                split.category_key, split.amount, names.categories
             )
-        else:
-            postings_list.append(
+            order = (cat_acc, payee_acc) if is_expense else (payee_acc, cat_acc)
+            values = (split_abs, split_neg)
+            comments = (split.memo, "")
+            postings_list.extend(
                 HledgerPosting(
-                    account=acc_name, amount=abs_total, currency=currency_iso
-                )
-            )
-            postings_list.append(
-                HledgerPosting(
-                    account=payee_acc, amount=-abs_total, currency=currency_iso
+                    account=account,
+                    amount=value,
+                    currency=currency_iso,
+                    comment=comment,
                 )
+                for account, value, comment in zip(order, values, comments, strict=True)
             )
+
+        # Schritt 2: Kreditoren/Debitoren ↔ Konto
+        order = (payee_acc, acc_name) if is_expense else (acc_name, payee_acc)
+        values = (abs_total, neg_total)
+        postings_list.extend(
+            HledgerPosting(account=account, amount=value, currency=currency_iso)
+            for account, value in zip(order, values, strict=True)
+        )
     else:
         # Kein Payee: direkte Buchung ohne Durchlaufkonto
         for split in txn.splits:
-            cat_acc = _category_account(split.category_key, split.amount, hb.categories)
-            comment = split.memo if split.memo else ""
+            cat_acc = _category_account(
+                split.category_key, split.amount, names.categories
+            )
             postings_list.append(
                 HledgerPosting(
                     account=cat_acc,
                     amount=abs(split.amount),
                     currency=currency_iso,
-                    comment=comment,
+                    comment=split.memo,
                 )
             )
         postings_list.append(
@@ -438,27 +468,23 @@ def _convert_split_transaction(
 def _build_opening_balance(
     year: int,
     balances: dict[int, Decimal],
-    hb: HomebankFile,
     base_currency_iso: str,
+    names: _NameTables,
 ) -> HledgerTransaction | None:
     """
     Erstellt die Eröffnungsbuchung für ein Jahr.
 
     Salden sind die berechneten Kontostände zum 31.12. des Vorjahres.
     """
-    non_zero = {k: v for k, v in balances.items() if v != Decimal(0)}
-    if not non_zero:
-        return None
-
     postings_list: list[HledgerPosting] = []
-    for acc_key, balance in sorted(non_zero.items()):
-        account = hb.accounts.get(acc_key)
-        if account is None:
+    # Nur bekannte Konten, in aufsteigender Schlüsselreihenfolge
+    for acc_key in names.account_keys:
+        balance = balances.get(acc_key, _ZERO)
+        if balance == _ZERO:
             continue
-        acc_name = hledger_account_name(account)
+        acc_name = names.accounts[acc_key]
         # Währung des Kontos
-        currency = hb.currencies.get(account.currency_key)
-        iso = currency.iso if currency else base_currency_iso
+        iso = names.currencies[acc_key]
         postings_list.append(
             HledgerPosting(account=acc_name, amount=balance, currency=iso)
         )
@@ -489,6 +515,16 @@ def _build_opening_balance(
 # ---------------------------------------------------------------------------
 
 
+def _accumulate_balances(
+    balances: dict[int, Decimal], transactions: Iterable[Transaction]
+) -> None:
+    """Addiert die Beträge der Transaktionen auf die Kontostände (in place)."""
+    get = balances.get
+    for txn in transactions:
+        key = txn.account_key
+        balances[key] = get(key, _ZERO) + txn.amount
+
+
 def calculate_balances_up_to(
     hb: HomebankFile,
     up_to_date: date,
@@ -497,20 +533,16 @@ def calculate_balances_up_to(
     Berechnet die Kontostände aller Konten bis einschließlich up_to_date.
 
     Berücksichtigt Anfangssalden und alle Transaktionen bis zum Stichtag.
+    Setzt chronologisch sortierte Transaktionen voraus (wie von parse_xhb).
     """
-    balances: dict[int, Decimal] = {}
-
     # Anfangssalden aller Konten
-    for acc_key, account in hb.accounts.items():
-        balances[acc_key] = account.initial_balance
-
-    # Transaktionen bis Stichtag aufsummieren
-    for txn in hb.transactions:
-        if txn.date > up_to_date:
-            break
-        balances[txn.account_key] = (
-            balances.get(txn.account_key, Decimal(0)) + txn.amount
-        )
+    balances: dict[int, Decimal] = {
+        acc_key: account.initial_balance for acc_key, account in hb.accounts.items()
+    }
+
+    # Stichtag per Binärsuche lokalisieren, dann ohne Datumsvergleich aufsummieren
+    cutoff = bisect_right(hb.transactions, up_to_date, key=attrgetter("date"))
+    _accumulate_balances(balances, islice(hb.transactions, cutoff))
 
     return balances
 
@@ -522,6 +554,44 @@ def convert(hb: HomebankFile) -> list[HledgerJournal]:
     Returns:
         Sortierte Liste von HledgerJournal-Objekten (ältestes zuerst)
     """
+    return list(iter_journals(hb))
+
+
+def _slice_by_year(transactions: list[Transaction]) -> dict[int, list[Transaction]]:
+    """
+    Teilt chronologisch sortierte Transaktionen in Jahresabschnitte auf.
+
+    Die Binärsuche setzt die Sortierung voraus; iter_journals übergibt daher
+    seine sortierte Kopie, nie hb.transactions direkt.
+
+    Statt jede Transaktion einzeln einzusortieren, wird pro Jahr nur die
+    Grenze zum Folgejahr gesucht (O(Y·log N)). Jahre ohne Transaktionen werden
+    übersprungen und fehlen im Ergebnis.
+    """
+    by_year: dict[int, list[Transaction]] = {}
+    get_date = attrgetter("date")
+    start = 0
+    total = len(transactions)
+    while start < total:
+        year = transactions[start].date.year
+        if year == MAXYEAR:
+            end = total
+        else:
+            end = bisect_left(
+                transactions, date(year + 1, 1, 1), lo=start, key=get_date
+            )
+        by_year[year] = transactions[start:end]
+        start = end
+    return by_year
+
+
+def iter_journals(hb: HomebankFile) -> Iterator[HledgerJournal]:
+    """
+    Erzeugt die HledgerJournale eines HomebankFile nacheinander (ältestes zuerst).
+
+    Im Gegensatz zu convert() wird jedes Jahr erst bei Bedarf aufgebaut, sodass
+    ein Aufrufer es schreiben und freigeben kann, bevor das nächste entsteht.
+    """
     base_currency = hb.base_currency()
     base_iso = base_currency.iso
 
@@ -530,66 +600,85 @@ def convert(hb: HomebankFile) -> list[HledgerJournal]:
         logger.warning(
             "Keine Transaktionen gefunden — leere Journalliste wird zurückgegeben"
         )
-        return []
-
-    years = sorted({txn.date.year for txn in hb.transactions})
+        return
+
+    # Einmal stabil nach Datum sortieren: hb.transactions kann nach dem Parsen
+    # ergänzt worden sein. Für die sortierte Ausgabe von parse_xhb ist das ein
+    # einzelner linearer Durchlauf (Timsort erkennt den sortierten Lauf).
+    transactions = sorted(hb.transactions, key=attrgetter("date"))
+
+    # kxfer-Paare: die zuerst auftretende Seite festhalten; nur sie wird
+    # gebucht. So hängt kein Jahr vom Zustand eines anderen ab.
+    kxfer_owner: dict[int, Transaction] = {}
+    for txn in transactions:
+        if txn.kxfer is not None and txn.is_internal_transfer:
+            kxfer_owner.setdefault(txn.kxfer, txn)
+
+    # Jedes Jahr ist ein zusammenhängender Abschnitt, dessen Grenzen per
+    # Binärsuche gefunden werden.
+    txns_by_year = _slice_by_year(transactions)
+    years = list(txns_by_year)
+    first_year = years[0]
     logger.info("Gefundene Jahre: %s", years)
 
-    # Transaktionen nach Jahr gruppieren
-    txns_by_year: dict[int, list[Transaction]] = defaultdict(list)
-    for txn in hb.transactions:
-        txns_by_year[txn.date.year].append(txn)
+    # Konto- und Kategorienamen einmalig berechnen statt pro Posting
+    names = _build_name_tables(hb, base_iso)
 
-    # kxfer-Paare: immer nur die erste Seite (kleinerer account_key) ausgeben
-    # Wir sammeln alle gesehenen kxfer-Werte global
-    seen_kxfer: set[int] = set()
-
-    journals: list[HledgerJournal] = []
+    # Laufende Kontostände: vor jedem Jahr der Stand zum 31.12. des Vorjahres.
+    # Jede Transaktion wird genau einmal aufaddiert — O(N) statt O(N·Y).
+    balances: dict[int, Decimal] = {
+        acc_key: account.initial_balance for acc_key, account in hb.accounts.items()
+    }
 
     for year in years:
-        journal = _build_journal(
+        year_txns = txns_by_year[year]
+        yield _build_journal(
             year=year,
-            transactions=txns_by_year[year],
-            hb=hb,
+            transactions=year_txns,
+            opening_balances=dict(balances) if year > first_year else None,
             base_iso=base_iso,
-            seen_kxfer=seen_kxfer,
+            kxfer_owner=kxfer_owner,
+            names=names,
         )
-        journals.append(journal)
 
-    return journals
+        _accumulate_balances(balances, year_txns)
 
 
 def _build_journal(
     year: int,
     transactions: list[Transaction],
-    hb: HomebankFile,
+    opening_balances: dict[int, Decimal] | None,
     base_iso: str,
-    seen_kxfer: set[int],
+    kxfer_owner: dict[int, Transaction],
+    names: _NameTables,
 ) -> HledgerJournal:
-    """Erstellt ein HledgerJournal für ein einzelnes Jahr."""
+    """
+    Erstellt ein HledgerJournal für ein einzelnes Jahr.
+
+    transactions muss chronologisch sortiert sein. opening_balances enthält die
+    Kontostände zum 31.12. des Vorjahres (None = keine Eröffnungsbuchung).
+    """
     journal = HledgerJournal(year=year, base_currency_iso=base_iso)
 
     # --- Konto-Deklarationen ---
-    _add_account_declarations(journal, hb, base_iso)
+    _add_account_declarations(journal, names)
 
     # --- Payee-Deklarationen ---
-    for payee in sorted(hb.payees.values(), key=lambda p: p.name):
+    for payee in names.sorted_payees:
         safe_name = _sanitize_account_name(payee.name)
         if safe_name:
             journal.payee_declarations.append(safe_name)
 
     # --- Eröffnungsbuchung ---
-    if year > min(txn.date.year for txn in hb.transactions):
-        prev_year_end = date(year - 1, 12, 31)
-        balances = calculate_balances_up_to(hb, prev_year_end)
-        opening = _build_opening_balance(year, balances, hb, base_iso)
+    if opening_balances is not None:
+        opening = _build_opening_balance(year, opening_balances, base_iso, names)
         if opening is not None:
             journal.transactions.append(opening)
 
     # --- Transaktionen konvertieren ---
-    for txn in sorted(transactions, key=lambda t: t.date):
+    for txn in transactions:
         try:
-            hledger_txn = _convert_single_transaction(txn, hb, base_iso, seen_kxfer)
+            hledger_txn = _convert_single_transaction(txn, base_iso, kxfer_owner, names)
         except ConversionError as exc:
             logger.warning("Transaktion übersprungen: %s", exc)
             continue
@@ -599,35 +688,14 @@ def _build_journal(
     return journal
 
 
-def _add_account_declarations(
-    journal: HledgerJournal,
-    hb: HomebankFile,
-    base_iso: str,
-) -> None:
+def _add_account_declarations(journal: HledgerJournal, names: _NameTables) -> None:
     """Fügt alle Konto-Deklarationen mit type-Tags zum Journal hinzu."""
     # Feste Hauptkonten
-    journal.account_declarations.extend(
-        [
-            "account Aktiva                                  ; type: A",
-            "account Aktiva:Bank                             ; type: C",
-            "account Aktiva:Kasse                            ; type: C",
-            "account Aktiva:Vermögen                         ; type: A",
-            "account Aktiva:Spareinlagen                     ; type: A",
-            "account Aktiva:Debitoren                        ; type: A",
-            "account Passiva                                 ; type: L",
-            "account Passiva:Kreditkarte                     ; type: L",
-            "account Passiva:Darlehen                        ; type: L",
-            "account Passiva:Kreditoren                      ; type: L",
-            "account Eigenkapital                            ; type: E",
-            "account Eigenkapital:Eröffnungsbilanzkonto      ; type: E",
-            "account Erträge                                 ; type: R",
-            "account Aufwand                                 ; type: X",
-        ]
-    )
+    journal.account_declarations.extend(_STATIC_ACCOUNT_DECLARATIONS)
 
     # Individuelle Konten
-    for account in sorted(hb.accounts.values(), key=lambda a: a.name):
-        acc_name = hledger_account_name(account)
+    for account in names.sorted_accounts:
+        acc_name = names.accounts[account.key]
         type_tag = hledger_account_type_tag(account.account_type)
         # Geschlossene Konten: Kommentar als Comma-Tag im selben Semikolon.
         # Zweites ';' würde hledger dazu verleiten, 'C  ; ...' als type-Code zu parsen.
@@ -638,7 +706,7 @@ def _add_account_declarations(
         journal.account_declarations.append(entry)
 
     # Debitoren-Konten für Payees (Einnahmen)
-    for payee in sorted(hb.payees.values(), key=lambda p: p.name):
+    for payee in names.sorted_payees:
         safe_name = _sanitize_account_name(payee.name)
         if safe_name:
             journal.account_declarations.append(
@@ -649,10 +717,8 @@ def _add_account_declarations(
             )
 
     # Kategorie-Konten
-    for cat in sorted(hb.categories.values(), key=lambda c: c.name):
-        path = _category_path(cat.key, hb.categories)
-        prefix = "Erträge" if cat.is_income else "Aufwand"
-        acc_name = f"{prefix}:{path}"
+    for cat in names.sorted_categories:
+        acc_name = names.categories[cat.key]
         type_tag = "R" if cat.is_income else "X"
         journal.account_declarations.append(
             f"account {acc_name:<55} ; type: {type_tag}"
@@ -661,36 +727,31 @@ def _add_account_declarations(
 
 def _convert_single_transaction(
     txn: Transaction,
-    hb: HomebankFile,
     base_iso: str,
-    seen_kxfer: set[int],
+    kxfer_owner: dict[int, Transaction],
+    names: _NameTables,
 ) -> HledgerTransaction | None:
     """
     Konvertiert eine einzelne Transaktion.
 
+    kxfer_owner ordnet jedem kxfer-Wert die Seite der internen Überweisung zu,
+    die gebucht wird; die Gegenseite wird unterdrückt.
+
     Returns:
         HledgerTransaction oder None (wenn Duplikat einer internen Überweisung)
     """
+    # Währung des (Quell-)Kontos
+    iso = names.currencies.get(txn.account_key, base_iso)
+
     # Interne Überweisung: kxfer-Duplikat unterdrücken
     if txn.is_internal_transfer:
         assert txn.kxfer is not None
-        if txn.kxfer in seen_kxfer:
+        if kxfer_owner.get(txn.kxfer) is not txn:
             return None
-        seen_kxfer.add(txn.kxfer)
-
-        # Währung des Quellkontos
-        account = hb.accounts.get(txn.account_key)
-        currency = hb.currencies.get(account.currency_key) if account else None
-        iso = currency.iso if currency else base_iso
-
-        return _convert_internal_transfer(txn, hb, iso)
 
-    # Währung des Kontos bestimmen
-    account = hb.accounts.get(txn.account_key)
-    currency = hb.currencies.get(account.currency_key) if account else None
-    iso = currency.iso if currency else base_iso
+        return _convert_internal_transfer(txn, iso, names)
 
     if txn.is_split:
-        return _convert_split_transaction(txn, hb, iso)
+        return _convert_split_transaction(txn, iso, names)
 
-    return _convert_normal_transaction(txn, hb, iso)
+    return _convert_normal_transaction(txn, iso, names)
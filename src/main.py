@@ -5,7 +5,7 @@ import logging
 import sys
 from pathlib import Path
 
-from src.converter import convert
+from src.converter import iter_journals
 from src.exceptions import ConversionError, HomebankParseError
 from src.parser import parse_xhb
 from src.writer import write_journals
@@ -94,30 +94,26 @@ def main() -> None:
         print(f"Fehler beim Lesen der XHB-Datei: {exc}", file=sys.stderr)
         sys.exit(1)
 
-    # Schritt 2: Konvertierung
+    # Schritt 2+3: Jahresweise konvertieren und sofort schreiben, damit nie
+    # mehr als ein Journal gleichzeitig im Speicher liegt
     try:
-        journals = convert(hb_file)
+        years, total_txns = write_journals(iter_journals(hb_file), args.ausgabe)
     except ConversionError as exc:
         print(f"Konvertierungsfehler: {exc}", file=sys.stderr)
         sys.exit(2)
+    except OSError as exc:
+        print(f"Fehler beim Schreiben der Ausgabedateien: {exc}", file=sys.stderr)
+        sys.exit(3)
 
-    if not journals:
+    if not years:
         print(
             "Warnung: Keine Transaktionen gefunden — keine Journaldateien erstellt.",
             file=sys.stderr,
         )
         sys.exit(0)
 
-    # Schritt 3: Journale schreiben
-    try:
-        write_journals(journals, args.ausgabe)
-    except OSError as exc:
-        print(f"Fehler beim Schreiben der Ausgabedateien: {exc}", file=sys.stderr)
-        sys.exit(3)
-
-    total_txns = sum(len(j.transactions) for j in journals)
     print(
-        f"{len(journals)} Journal-Datei(en) mit insgesamt {total_txns} "
+        f"{len(years)} Journal-Datei(en) mit insgesamt {total_txns} "
         f"Buchungen in '{args.ausgabe}' erstellt.",
         file=sys.stderr,
     )
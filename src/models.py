@@ -9,7 +9,7 @@ from decimal import Decimal
 # ---------------------------------------------------------------------------
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Currency:
     """Eine in Homebank definierte Währung."""
 
@@ -23,7 +23,7 @@ class Currency:
     rate: Decimal  # Wechselkurs gegenüber Basiswährung (0 = Basiswährung)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Group:
     """Eine Kontengruppe in Homebank."""
 
@@ -44,7 +44,7 @@ ACCOUNT_TYPE_SAVINGS = 7  # Sparbuch / Savings (Homebank type=7)
 AF_CLOSED = 1 << 1  # Konto geschlossen/archiviert
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Account:
     """Ein Konto in Homebank."""
 
@@ -65,7 +65,7 @@ class Account:
         return bool(self.flags & AF_CLOSED)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Payee:
     """Ein Zahlungsempfänger/-auftraggeber in Homebank."""
 
@@ -75,7 +75,7 @@ class Payee:
     default_paymode: int | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Category:
     """Eine Buchungskategorie in Homebank."""
 
@@ -99,7 +99,7 @@ class Category:
         return self.parent_key is not None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Split:
     """Eine Teilbuchung innerhalb einer Splittransaktion."""
 
@@ -119,7 +119,7 @@ TXN_STATUS_RECONCILED = 2
 TXN_STATUS_REMIND = 3
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Transaction:
     """Eine Transaktion (Buchung) in Homebank."""
 
@@ -149,7 +149,7 @@ class Transaction:
         return self.kxfer is not None and self.dst_account_key is not None
 
 
-@dataclass
+@dataclass(slots=True)
 class HomebankFile:
     """Der vollständige Inhalt einer Homebank-XHB-Datei."""
 
@@ -171,7 +171,7 @@ class HomebankFile:
 # ---------------------------------------------------------------------------
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class HledgerPosting:
     """Eine Buchungszeile in einer hledger-Transaktion."""
 
@@ -181,7 +181,7 @@ class HledgerPosting:
     comment: str = ""
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class HledgerTransaction:
     """Eine vollständige hledger-Transaktion."""
 
@@ -193,7 +193,7 @@ class HledgerTransaction:
     comment: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class HledgerJournal:
     """Ein hledger-Journal für ein Kalenderjahr."""
 
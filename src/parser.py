@@ -1,10 +1,14 @@
 """Parser für Homebank XHB-Dateien (XML-Format)."""
 
 import logging
-import xml.etree.ElementTree as ET
+from collections.abc import Callable
 from datetime import date
 from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+from itertools import repeat
+from operator import attrgetter
 from pathlib import Path
+from xml.parsers import expat
 
 from src.exceptions import HomebankParseError
 from src.models import (
@@ -22,48 +26,65 @@ from src.models import (
 
 logger = logging.getLogger(__name__)
 
+# Gleiche Texte (Buchungstexte, Tags, Memos, Namen) wiederholen sich über
+# tausende Transaktionen; sie teilen sich pro Parse-Lauf ein str-Objekt.
+_STR_CACHE: dict[str, str] = {}
 
-def _require_attr(element: ET.Element, attr: str) -> str:
+
+def _intern(value: str) -> str:
+    """Gibt eine geteilte Instanz für wiederkehrende Strings zurück."""
+    return _STR_CACHE.setdefault(value, value)
+
+
+@lru_cache(maxsize=8192)
+def _decimal_from_str(raw: str) -> Decimal:
+    """Wandelt einen Betrag-String in Decimal um (gecacht, Decimal ist immutable)."""
+    return Decimal(raw)
+
+
+def _require_attr(tag: str, attrs: dict[str, str], attr: str) -> str:
     """Gibt ein Pflichtattribut zurück oder wirft HomebankParseError."""
-    value = element.get(attr)
+    value = attrs.get(attr)
     if value is None:
-        raise HomebankParseError(
-            f"Pflichtattribut '{attr}' fehlt in Element <{element.tag}>"
-        )
+        raise HomebankParseError(f"Pflichtattribut '{attr}' fehlt in Element <{tag}>")
     return value
 
 
-def _int_attr(element: ET.Element, attr: str, default: int = 0) -> int:
+def _int_attr(tag: str, attrs: dict[str, str], attr: str, default: int = 0) -> int:
     """Liest ein Integer-Attribut mit optionalem Standardwert."""
-    raw = element.get(attr)
+    raw = attrs.get(attr)
     if raw is None:
         return default
     try:
         return int(raw)
     except ValueError as exc:
         raise HomebankParseError(
-            f"Ungültiger Integer-Wert '{raw}' für Attribut '{attr}' "
-            f"in Element <{element.tag}>"
+            f"Ungültiger Integer-Wert '{raw}' für Attribut '{attr}' in Element <{tag}>"
         ) from exc
 
 
 def _decimal_attr(
-    element: ET.Element, attr: str, default: Decimal = Decimal(0)
+    tag: str, attrs: dict[str, str], attr: str, default: Decimal = Decimal(0)
 ) -> Decimal:
     """Liest einen Dezimalbetrag direkt aus dem XML-String (kein float-Umweg)."""
-    raw = element.get(attr)
+    raw = attrs.get(attr)
     if raw is None:
         return default
     try:
-        return Decimal(raw)
+        return _decimal_from_str(raw)
     except InvalidOperation as exc:
         raise HomebankParseError(
-            f"Ungültiger Dezimalwert '{raw}' für Attribut '{attr}' "
-            f"in Element <{element.tag}>"
+            f"Ungültiger Dezimalwert '{raw}' für Attribut '{attr}' in Element <{tag}>"
         ) from exc
 
 
-def _parse_hb_date(value: str, element: ET.Element) -> date:
+@lru_cache(maxsize=65536)
+def _julian_to_date(value: str) -> date:
+    """Wandelt einen Julian-Day-String in ein Datum um (gecacht)."""
+    return date.fromordinal(int(value))
+
+
+def _parse_hb_date(value: str, tag: str) -> date:
     """
     Konvertiert einen Homebank-Datumswert (GLib Julian Day = Python-Ordinalzahl).
 
@@ -71,139 +92,145 @@ def _parse_hb_date(value: str, element: ET.Element) -> date:
     Epoch: 1. Januar 1 AD = 1 (identisch mit Python).
     """
     try:
-        ordinal = int(value)
-        return date.fromordinal(ordinal)
+        # Viele Buchungen teilen sich ein Datum, daher der Cache
+        return _julian_to_date(value)
     except (ValueError, OverflowError) as exc:
         raise HomebankParseError(
-            f"Ungültiger Datumswert '{value}' in Element <{element.tag}>"
+            f"Ungültiger Datumswert '{value}' in Element <{tag}>"
         ) from exc
 
 
-def _parse_splits(
-    scat: str, samt: str, smem: str, element: ET.Element
-) -> tuple[Split, ...]:
+def _split_amount(amt_str: str, tag: str) -> Decimal:
+    """Parst einen einzelnen Split-Betrag."""
+    try:
+        return _decimal_from_str(amt_str)
+    except InvalidOperation as exc:
+        raise HomebankParseError(
+            f"Ungültiger Split-Betrag '{amt_str}' in <{tag}>"
+        ) from exc
+
+
+def _parse_splits(scat: str, samt: str, smem: str, tag: str) -> tuple[Split, ...]:
     """Parst die Split-Attribute einer Transaktion."""
     cats = scat.split("||")
     amts = samt.split("||")
-    mems = smem.split("||") if smem else [""] * len(cats)
 
     if len(cats) != len(amts):
         raise HomebankParseError(
-            f"Inkonsistente Split-Listen in <{element.tag}>: "
+            f"Inkonsistente Split-Listen in <{tag}>: "
             f"scat hat {len(cats)} Einträge, samt hat {len(amts)}"
         )
 
-    splits: list[Split] = []
-    for cat_str, amt_str, mem in zip(cats, amts, mems, strict=False):
-        cat_key: int | None = int(cat_str) if cat_str.strip() else None
-        try:
-            amount = Decimal(amt_str)
-        except InvalidOperation as exc:
-            raise HomebankParseError(
-                f"Ungültiger Split-Betrag '{amt_str}' in <{element.tag}>"
-            ) from exc
-        splits.append(Split(amount=amount, category_key=cat_key, memo=mem))
+    # Ohne Memos keine Liste leerer Strings anlegen
+    mems = smem.split("||") if smem else repeat("", len(cats))
 
-    return tuple(splits)
+    return tuple(
+        Split(
+            amount=_split_amount(amt_str, tag),
+            category_key=int(cat_str) if cat_str.strip() else None,
+            memo=_intern(mem),
+        )
+        for cat_str, amt_str, mem in zip(cats, amts, mems, strict=False)
+    )
 
 
-def _parse_currency(element: ET.Element) -> Currency:
+def _parse_currency(tag: str, attrs: dict[str, str]) -> Currency:
     """Parst ein <cur>-Element."""
-    key = _int_attr(element, "key")
+    key = _int_attr(tag, attrs, "key")
     if key == 0:
         raise HomebankParseError("Währung mit key=0 ist ungültig")
     return Currency(
         key=key,
-        iso=element.get("iso", ""),
-        name=element.get("name", ""),
-        symbol=element.get("symb", ""),
-        decimal_char=element.get("dchar", "."),
-        group_char=element.get("gchar", ","),
-        fraction=_int_attr(element, "frac", 2),
-        rate=_decimal_attr(element, "rate"),
+        iso=attrs.get("iso", ""),
+        name=attrs.get("name", ""),
+        symbol=attrs.get("symb", ""),
+        decimal_char=attrs.get("dchar", "."),
+        group_char=attrs.get("gchar", ","),
+        fraction=_int_attr(tag, attrs, "frac", 2),
+        rate=_decimal_attr(tag, attrs, "rate"),
     )
 
 
-def _parse_group(element: ET.Element) -> Group:
+def _parse_group(tag: str, attrs: dict[str, str]) -> Group:
     """Parst ein <grp>-Element."""
     return Group(
-        key=_int_attr(element, "key"),
-        name=element.get("name", ""),
+        key=_int_attr(tag, attrs, "key"),
+        name=attrs.get("name", ""),
     )
 
 
-def _parse_account(element: ET.Element) -> Account:
+def _parse_account(tag: str, attrs: dict[str, str]) -> Account:
     """Parst ein <account>-Element."""
-    key = _int_attr(element, "key")
+    key = _int_attr(tag, attrs, "key")
     if key == 0:
         raise HomebankParseError("Konto mit key=0 ist ungültig")
-    type_raw = element.get("type")
+    type_raw = attrs.get("type")
     account_type = int(type_raw) if type_raw is not None else ACCOUNT_TYPE_NONE
-    grp_raw = element.get("grp")
+    grp_raw = attrs.get("grp")
     return Account(
         key=key,
-        name=element.get("name", ""),
+        name=attrs.get("name", ""),
         account_type=account_type,
-        currency_key=_int_attr(element, "curr", 0),
-        initial_balance=_decimal_attr(element, "initial"),
-        flags=_int_attr(element, "flags", 0),
-        number=element.get("number", ""),
-        bank_name=element.get("bankname", ""),
-        notes=element.get("notes", ""),
+        currency_key=_int_attr(tag, attrs, "curr", 0),
+        initial_balance=_decimal_attr(tag, attrs, "initial"),
+        flags=_int_attr(tag, attrs, "flags", 0),
+        number=attrs.get("number", ""),
+        bank_name=attrs.get("bankname", ""),
+        notes=attrs.get("notes", ""),
         group_key=int(grp_raw) if grp_raw is not None else None,
     )
 
 
-def _parse_payee(element: ET.Element) -> Payee:
+def _parse_payee(tag: str, attrs: dict[str, str]) -> Payee:
     """Parst ein <pay>-Element."""
-    cat_raw = element.get("category")
-    mode_raw = element.get("paymode")
+    cat_raw = attrs.get("category")
+    mode_raw = attrs.get("paymode")
     return Payee(
-        key=_int_attr(element, "key"),
-        name=element.get("name", ""),
+        key=_int_attr(tag, attrs, "key"),
+        name=_intern(attrs.get("name", "")),
         default_category_key=int(cat_raw) if cat_raw is not None else None,
         default_paymode=int(mode_raw) if mode_raw is not None else None,
     )
 
 
-def _parse_category(element: ET.Element) -> Category:
+def _parse_category(tag: str, attrs: dict[str, str]) -> Category:
     """Parst ein <cat>-Element."""
-    parent_raw = element.get("parent")
+    parent_raw = attrs.get("parent")
     return Category(
-        key=_int_attr(element, "key"),
-        name=element.get("name", ""),
-        flags=_int_attr(element, "flags", 0),
+        key=_int_attr(tag, attrs, "key"),
+        name=_intern(attrs.get("name", "")),
+        flags=_int_attr(tag, attrs, "flags", 0),
         parent_key=int(parent_raw) if parent_raw is not None else None,
     )
 
 
-def _parse_transaction(element: ET.Element) -> Transaction:
+def _parse_transaction(tag: str, attrs: dict[str, str]) -> Transaction:
     """Parst ein <ope>-Element (Transaktion)."""
-    date_raw = _require_attr(element, "date")
-    txn_date = _parse_hb_date(date_raw, element)
+    date_raw = _require_attr(tag, attrs, "date")
+    txn_date = _parse_hb_date(date_raw, tag)
 
-    amount = _decimal_attr(element, "amount")
-    account_key = _int_attr(element, "account")
-    flags = _int_attr(element, "flags", 0)
-    status = _int_attr(element, "st", 0)
-    paymode = _int_attr(element, "paymode", 0)
+    amount = _decimal_attr(tag, attrs, "amount")
+    account_key = _int_attr(tag, attrs, "account")
+    flags = _int_attr(tag, attrs, "flags", 0)
+    status = _int_attr(tag, attrs, "st", 0)
+    paymode = _int_attr(tag, attrs, "paymode", 0)
 
-    payee_raw = element.get("payee")
-    cat_raw = element.get("category")
-    kxfer_raw = element.get("kxfer")
-    dst_raw = element.get("dst_account")
+    payee_raw = attrs.get("payee")
+    cat_raw = attrs.get("category")
+    kxfer_raw = attrs.get("kxfer")
+    dst_raw = attrs.get("dst_account")
 
-    tags_raw = element.get("tags", "")
-    tags = tuple(t for t in tags_raw.split(" ") if t) if tags_raw else ()
+    tags_raw = attrs.get("tags", "")
+    tags = tuple(_intern(t) for t in tags_raw.split(" ") if t) if tags_raw else ()
 
     # Splits parsen (nur wenn OF_SPLIT-Flag gesetzt)
     splits: tuple[Split, ...] = ()
     if flags & OF_SPLIT:
-        scat = element.get("scat", "")
-        samt = element.get("samt", "")
-        smem = element.get("smem", "")
+        scat = attrs.get("scat", "")
+        samt = attrs.get("samt", "")
+        smem = attrs.get("smem", "")
         if scat and samt:
-            splits = _parse_splits(scat, samt, smem, element)
+            splits = _parse_splits(scat, samt, smem, tag)
 
     return Transaction(
         date=txn_date,
@@ -214,8 +241,8 @@ def _parse_transaction(element: ET.Element) -> Transaction:
         paymode=paymode,
         payee_key=int(payee_raw) if payee_raw is not None else None,
         category_key=int(cat_raw) if cat_raw is not None else None,
-        wording=element.get("wording", ""),
-        info=element.get("info", ""),
+        wording=_intern(attrs.get("wording", "")),
+        info=_intern(attrs.get("info", "")),
         tags=tags,
         kxfer=int(kxfer_raw) if kxfer_raw is not None else None,
         dst_account_key=int(dst_raw) if dst_raw is not None else None,
@@ -223,6 +250,47 @@ def _parse_transaction(element: ET.Element) -> Transaction:
     )
 
 
+def _store_currency(hb_file: HomebankFile, tag: str, attrs: dict[str, str]) -> None:
+    cur = _parse_currency(tag, attrs)
+    hb_file.currencies[cur.key] = cur
+
+
+def _store_group(hb_file: HomebankFile, tag: str, attrs: dict[str, str]) -> None:
+    grp = _parse_group(tag, attrs)
+    hb_file.groups[grp.key] = grp
+
+
+def _store_account(hb_file: HomebankFile, tag: str, attrs: dict[str, str]) -> None:
+    acc = _parse_account(tag, attrs)
+    hb_file.accounts[acc.key] = acc
+
+
+def _store_payee(hb_file: HomebankFile, tag: str, attrs: dict[str, str]) -> None:
+    pay = _parse_payee(tag, attrs)
+    hb_file.payees[pay.key] = pay
+
+
+def _store_category(hb_file: HomebankFile, tag: str, attrs: dict[str, str]) -> None:
+    cat = _parse_category(tag, attrs)
+    hb_file.categories[cat.key] = cat
+
+
+def _store_transaction(hb_file: HomebankFile, tag: str, attrs: dict[str, str]) -> None:
+    hb_file.transactions.append(_parse_transaction(tag, attrs))
+
+
+# Tag → Handler, der das Element parst und im HomebankFile ablegt.
+# Ein Dict-Lookup pro Element statt einer if/elif-Kette.
+_ELEMENT_HANDLERS: dict[str, Callable[[HomebankFile, str, dict[str, str]], None]] = {
+    "cur": _store_currency,
+    "grp": _store_group,
+    "account": _store_account,
+    "pay": _store_payee,
+    "cat": _store_category,
+    "ope": _store_transaction,
+}
+
+
 def parse_xhb(path: Path) -> HomebankFile:
     """
     Liest und parst eine Homebank XHB-Datei.
@@ -244,46 +312,34 @@ def parse_xhb(path: Path) -> HomebankFile:
 
     logger.info("Lese XHB-Datei: %s", path)
 
-    try:
-        tree = ET.parse(path)  # noqa: S314 - lokale Datei, kein Netzwerk
-    except ET.ParseError as exc:
-        raise HomebankParseError(f"XML-Parsing-Fehler in '{path}': {exc}") from exc
+    # Basiswährung wird nach dem Parsen aus <properties> gesetzt
+    hb_file = HomebankFile(base_currency_key=0)
+    base_currency_key: int | None = None
+    depth = 0
+
+    # expat direkt statt ElementTree: alle relevanten Daten stehen in den
+    # Attributen der Kinder von <homebank>, daher genügt der Start-Callback.
+    # Es werden keine Element-Objekte erzeugt, der Speicherbedarf bleibt
+    # unabhängig von der Anzahl der Transaktionen.
+    def start_element(tag: str, attrs: dict[str, str]) -> None:
+        nonlocal base_currency_key, depth
+        depth += 1
+        if depth == 1:
+            if tag != "homebank":
+                raise HomebankParseError(
+                    f"Unerwartetes Root-Element: <{tag}> (erwartet: <homebank>)"
+                )
+            return
+        if depth != 2:
+            return
 
-    root = tree.getroot()
-    if root.tag != "homebank":
-        raise HomebankParseError(
-            f"Unerwartetes Root-Element: <{root.tag}> (erwartet: <homebank>)"
-        )
-
-    # Basiswährung aus <properties>
-    props = root.find("properties")
-    if props is None:
-        raise HomebankParseError("Pflicht-Element <properties> fehlt in der XHB-Datei")
-    base_currency_key = _int_attr(props, "curr", 1)
-
-    hb_file = HomebankFile(base_currency_key=base_currency_key)
-
-    for element in root:
-        tag = element.tag
         try:
-            if tag == "cur":
-                cur = _parse_currency(element)
-                hb_file.currencies[cur.key] = cur
-            elif tag == "grp":
-                grp = _parse_group(element)
-                hb_file.groups[grp.key] = grp
-            elif tag == "account":
-                acc = _parse_account(element)
-                hb_file.accounts[acc.key] = acc
-            elif tag == "pay":
-                pay = _parse_payee(element)
-                hb_file.payees[pay.key] = pay
-            elif tag == "cat":
-                cat = _parse_category(element)
-                hb_file.categories[cat.key] = cat
-            elif tag == "ope":
-                txn = _parse_transaction(element)
-                hb_file.transactions.append(txn)
+            handler = _ELEMENT_HANDLERS.get(tag)
+            if handler is not None:
+                handler(hb_file, tag, attrs)
+            elif tag == "properties" and base_currency_key is None:
+                # Basiswährung aus <properties>
+                base_currency_key = _int_attr(tag, attrs, "curr", 1)
         except HomebankParseError:
             raise
         except Exception as exc:
@@ -291,8 +347,30 @@ def parse_xhb(path: Path) -> HomebankFile:
                 f"Unerwarteter Fehler beim Parsen von <{tag}>: {exc}"
             ) from exc
 
+    def end_element(tag: str) -> None:
+        nonlocal depth
+        depth -= 1
+
+    xml_parser = expat.ParserCreate()
+    xml_parser.StartElementHandler = start_element
+    xml_parser.EndElementHandler = end_element
+
+    try:
+        with path.open("rb") as xml_file:
+            xml_parser.ParseFile(xml_file)
+    except expat.ExpatError as exc:
+        raise HomebankParseError(f"XML-Parsing-Fehler in '{path}': {exc}") from exc
+    finally:
+        # Cache nicht über den Parse-Lauf hinaus festhalten
+        _STR_CACHE.clear()
+
+    if base_currency_key is None:
+        raise HomebankParseError("Pflicht-Element <properties> fehlt in der XHB-Datei")
+
+    hb_file.base_currency_key = base_currency_key
+
     # Transaktionen chronologisch sortieren
-    hb_file.transactions.sort(key=lambda t: t.date)
+    hb_file.transactions.sort(key=attrgetter("date"))
 
     logger.info(
         "Parsing abgeschlossen: %d Konten, %d Kategorien, "
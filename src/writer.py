@@ -1,7 +1,9 @@
 """Ausgabe der hledger-Journaldateien."""
 
 import logging
-from decimal import Decimal
+from collections.abc import Iterable, Iterator
+from decimal import ROUND_HALF_EVEN, Decimal
+from functools import lru_cache
 from pathlib import Path
 
 from src.models import HledgerJournal, HledgerPosting, HledgerTransaction
@@ -9,8 +11,18 @@ from src.models import HledgerJournal, HledgerPosting, HledgerTransaction
 logger = logging.getLogger(__name__)
 
 _INDENT = "    "  # 4 Leerzeichen Einrückung für Postings
+_WRITE_BUFFER_SIZE = 1 << 20  # 1 MiB Schreibpuffer für Journaldateien
 
+# Englisches Zahlenformat → deutsches: "," ↔ "." (translate tauscht gleichzeitig)
+_DE_TRANS = str.maketrans({",": ".", ".": ","})
+_Q2 = Decimal("0.01")  # Quantisierung auf 2 Nachkommastellen
 
+# Buchungszeile mit Betrag: Einrückung, Kontoname (48 Zeichen breit), Betrag,
+# optionaler Kommentar, Zeilenumbruch
+_POSTING_FMT = "%s%-48s  %s%s\n"
+
+
+@lru_cache(maxsize=8192)
 def _format_amount(amount: Decimal, currency: str) -> str:
     """
     Formatiert einen Betrag im deutschen Format (Komma als Dezimaltrennzeichen).
@@ -18,60 +30,36 @@ def _format_amount(amount: Decimal, currency: str) -> str:
     Beispiele:
         Decimal("1234.56") → "1.234,56 EUR"
         Decimal("-89.34") → "-89,34 EUR"
-    """
-    # Auf 2 Nachkommastellen runden
-    rounded = round(amount, 2)
-    # Vorzeichenbehandlung
-    negative = rounded < 0
-    abs_val = abs(rounded)
-
-    # In String mit 2 Nachkommastellen umwandeln (Python nutzt intern Punkt)
-    raw = f"{abs_val:.2f}"
-    integer_part, frac_part = raw.split(".")
-
-    # Tausenderpunkte einfügen
-    int_with_sep = _add_thousands_separator(integer_part)
-
-    # Deutsch: Komma als Dezimaltrennzeichen
-    formatted = f"{int_with_sep},{frac_part}"
-    if negative:
-        formatted = f"-{formatted}"
 
+    Gecacht: dieselben Beträge wiederholen sich über viele Postings. Gleiche
+    Decimal-Werte (z.B. 1.0 und 1.00) ergeben stets denselben Text.
+    """
+    # Auf 2 Nachkommastellen runden (Banker's Rounding wie round())
+    rounded = amount.quantize(_Q2, rounding=ROUND_HALF_EVEN)
+    # Ein Formatierungsschritt inkl. Tausendergruppierung, danach Punkt und
+    # Komma in einem translate()-Durchlauf auf deutsches Format tauschen.
+    # Das Vorzeichen wird separat gesetzt, damit -0,00 als 0,00 erscheint.
+    formatted = f"{abs(rounded):,.2f}".translate(_DE_TRANS)
+    if rounded < 0:
+        return f"-{formatted} {currency}"
     return f"{formatted} {currency}"
 
 
-def _add_thousands_separator(integer_str: str) -> str:
-    """Fügt Tausenderpunkte ein: '1234567' → '1.234.567'."""
-    result: list[str] = []
-    for i, digit in enumerate(reversed(integer_str)):
-        if i > 0 and i % 3 == 0:
-            result.append(".")
-        result.append(digit)
-    return "".join(reversed(result))
-
-
 def _format_posting(posting: HledgerPosting) -> str:
-    """Formatiert eine Buchungszeile."""
+    """Formatiert eine Buchungszeile (mit abschließendem Zeilenumbruch)."""
+    tail = "  ; " + posting.comment if posting.comment else ""
     if posting.amount is None:
         # Betrag wird von hledger inferiert
-        line = f"{_INDENT}{posting.account}"
-    else:
-        amount_str = _format_amount(posting.amount, posting.currency)
-        # Ausrichtung: Kontoname (40 Zeichen) + Abstand + Betrag
-        line = f"{_INDENT}{posting.account:<48}  {amount_str}"
-
-    if posting.comment:
-        line = f"{line}  ; {posting.comment}"
+        return "".join((_INDENT, posting.account, tail, "\n"))
 
-    return line
+    amount_str = _format_amount(posting.amount, posting.currency)
+    return _POSTING_FMT % (_INDENT, posting.account, amount_str, tail)
 
 
-def _format_transaction(txn: HledgerTransaction) -> list[str]:
-    """Formatiert eine vollständige Transaktion als Liste von Zeilen."""
-    lines: list[str] = []
-
+def _format_transaction(txn: HledgerTransaction) -> Iterator[str]:
+    """Erzeugt die Zeilen einer Transaktion, jeweils mit Zeilenumbruch."""
     # Beschreibungszeile: DATUM [STATUS] PAYEE | NOTIZ
-    date_str = txn.date.strftime("%Y-%m-%d")
+    date_str = txn.date.isoformat()  # YYYY-MM-DD, deutlich schneller als strftime
     status_part = f" {txn.status}" if txn.status else ""
 
     if txn.payee and txn.note:
@@ -83,57 +71,62 @@ def _format_transaction(txn: HledgerTransaction) -> list[str]:
     else:
         desc = "(keine Beschreibung)"
 
-    header = f"{date_str}{status_part} {desc}"
-    if txn.comment:
-        header = f"{header}  ; {txn.comment}"
-    lines.append(header)
+    tail = "  ; " + txn.comment if txn.comment else ""
+    yield "".join((date_str, status_part, " ", desc, tail, "\n"))
 
     # Buchungszeilen
     for posting in txn.postings:
-        lines.append(_format_posting(posting))
-
-    return lines
+        yield _format_posting(posting)
 
 
-def _format_journal(journal: HledgerJournal) -> str:
-    """Formatiert ein HledgerJournal als vollständigen Journal-Text."""
-    sections: list[str] = []
+def _iter_journal_lines(journal: HledgerJournal) -> Iterator[str]:
+    """
+    Erzeugt den Journal-Text eines HledgerJournal zeilenweise.
 
+    Jedes Element endet mit einem Zeilenumbruch, sodass die Zeilen direkt per
+    writelines() in eine Datei geschrieben werden können.
+    """
     # --- Datei-Header ---
-    sections.append(
-        f"; ============================================================\n"
-        f"; hledger Journal {journal.year}\n"
-        f"; Generiert von homebank-to-hledger\n"
-        f"; ============================================================\n"
-    )
+    yield "; ============================================================\n"
+    yield f"; hledger Journal {journal.year}\n"
+    yield "; Generiert von homebank-to-hledger\n"
+    yield "; ============================================================\n"
+    yield "\n"
 
     # --- Währungsdirektiven ---
-    sections.append("decimal-mark ,\n")
-    sections.append(f"commodity 1.000,00 {journal.base_currency_iso}\n")
+    yield "decimal-mark ,\n"
+    yield "\n"
+    yield f"commodity 1.000,00 {journal.base_currency_iso}\n"
 
     # --- Konto-Deklarationen ---
     if journal.account_declarations:
-        sections.append("; --- Konto-Deklarationen ---")
+        yield "\n"
+        yield "; --- Konto-Deklarationen ---\n"
         for decl in journal.account_declarations:
-            sections.append(decl)
-        sections.append("")
+            yield f"{decl}\n"
 
     # --- Payee-Deklarationen ---
     if journal.payee_declarations:
-        sections.append("; --- Zahlungsempfänger ---")
+        yield "\n"
+        yield "; --- Zahlungsempfänger ---\n"
         for payee in journal.payee_declarations:
-            sections.append(f"payee {payee}")
-        sections.append("")
+            yield f"payee {payee}\n"
 
-    # --- Transaktionen ---
+    # --- Transaktionen (durch Leerzeilen getrennt) ---
     if journal.transactions:
-        sections.append("; --- Buchungen ---")
+        yield "\n"
+        yield "; --- Buchungen ---\n"
+        first = True
         for txn in journal.transactions:
-            txn_lines = _format_transaction(txn)
-            sections.append("\n".join(txn_lines))
-            sections.append("")
+            if not first:
+                yield "\n"
+            first = False
+            yield from _format_transaction(txn)
+
 
-    return "\n".join(sections)
+def _render_journal(journal: HledgerJournal) -> str:
+    """Gibt den vollständigen Journal-Text zurück, wie write_journal ihn schreibt."""
+    return "".join(_iter_journal_lines(journal))
 
 
 def _format_main_journal(years: list[int]) -> str:
@@ -151,30 +144,79 @@ def _format_main_journal(years: list[int]) -> str:
     return "\n".join(lines)
 
 
-def write_journals(journals: list[HledgerJournal], output_dir: Path) -> None:
+def write_journal(journal: HledgerJournal, output_dir: Path) -> Path:
     """
-    Schreibt alle Journaldateien in das Ausgabeverzeichnis.
-
-    Erstellt außerdem eine main.journal mit include-Direktiven.
+    Schreibt ein einzelnes Jahresjournal in das Ausgabeverzeichnis.
 
     Args:
-        journals:    Liste der zu schreibenden Journale
+        journal:     Das zu schreibende Journal
         output_dir:  Zielverzeichnis (wird erstellt, wenn nicht vorhanden)
+
+    Returns:
+        Pfad der geschriebenen <Jahr>.journal-Datei
     """
     output_dir.mkdir(parents=True, exist_ok=True)
+    return _write_journal_file(journal, output_dir)
 
-    years: list[int] = []
-    for journal in sorted(journals, key=lambda j: j.year):
-        filename = f"{journal.year}.journal"
-        filepath = output_dir / filename
-        content = _format_journal(journal)
-        filepath.write_text(content, encoding="utf-8")
-        logger.info(
-            "Schreibe %s (%d Transaktionen)", filepath, len(journal.transactions)
-        )
-        years.append(journal.year)
 
-    # main.journal
+def _write_journal_file(journal: HledgerJournal, output_dir: Path) -> Path:
+    """Schreibt <Jahr>.journal in ein bereits existierendes Verzeichnis."""
+    filepath = output_dir / f"{journal.year}.journal"
+    # Zeilen direkt streamen statt den gesamten Text im Speicher aufzubauen
+    with filepath.open("w", encoding="utf-8", buffering=_WRITE_BUFFER_SIZE) as f:
+        f.writelines(_iter_journal_lines(journal))
+    logger.info("Schreibe %s (%d Transaktionen)", filepath, len(journal.transactions))
+    return filepath
+
+
+def write_main_journal(years: list[int], output_dir: Path) -> Path:
+    """
+    Schreibt die main.journal mit include-Direktiven für die angegebenen Jahre.
+
+    Returns:
+        Pfad der geschriebenen main.journal-Datei
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    return _write_main_journal_file(years, output_dir)
+
+
+def _write_main_journal_file(years: list[int], output_dir: Path) -> Path:
+    """Schreibt main.journal in ein bereits existierendes Verzeichnis."""
     main_path = output_dir / "main.journal"
     main_path.write_text(_format_main_journal(years), encoding="utf-8")
     logger.info("Schreibe %s", main_path)
+    return main_path
+
+
+def write_journals(
+    journals: Iterable[HledgerJournal], output_dir: Path
+) -> tuple[list[int], int]:
+    """
+    Schreibt alle Journaldateien in das Ausgabeverzeichnis.
+
+    Erstellt außerdem eine main.journal mit include-Direktiven, sofern
+    mindestens ein Journal geschrieben wurde; ohne Journale wird nichts
+    angelegt. journals darf ein Generator sein (z.B. iter_journals); jedes
+    Journal wird geschrieben, bevor das nächste angefordert wird. Das Schreiben
+    erfolgt bewusst sequenziell: so ist immer nur ein Jahr im Speicher, und das
+    Ausgabeverzeichnis wird nur einmal angelegt.
+
+    Args:
+        journals:    Die zu schreibenden Journale
+        output_dir:  Zielverzeichnis (wird beim ersten Journal erstellt)
+
+    Returns:
+        Die geschriebenen Jahre und die Gesamtzahl der Transaktionen
+    """
+    years: list[int] = []
+    total_txns = 0
+    for journal in journals:
+        if not years:
+            output_dir.mkdir(parents=True, exist_ok=True)
+        _write_journal_file(journal, output_dir)
+        years.append(journal.year)
+        total_txns += len(journal.transactions)
+
+    if years:
+        _write_main_journal_file(years, output_dir)
+    return years, total_txns
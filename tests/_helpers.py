@@ -0,0 +1,6 @@
+"""Gemeinsame Pfade für Fixtures und Tests."""
+
+from pathlib import Path
+
+FIXTURES = Path(__file__).parent / "fixtures"
+MINIMAL_XHB = FIXTURES / "minimal.xhb"
@@ -0,0 +1,57 @@
+"""Gemeinsame Fixtures für die Testsuite."""
+
+from pathlib import Path
+
+import pytest
+
+from src.converter import convert
+from src.models import HledgerJournal, HomebankFile, Transaction
+from src.parser import parse_xhb
+from src.writer import write_journals
+from tests._helpers import MINIMAL_XHB
+
+
+@pytest.fixture(scope="session")
+def parsed_minimal() -> HomebankFile:
+    """
+    Einmal pro Sitzung geparste minimal.xhb.
+
+    Nur lesend verwenden — Tests, die das HomebankFile verändern, müssen
+    parse_xhb() selbst aufrufen.
+    """
+    return parse_xhb(MINIMAL_XHB)
+
+
+@pytest.fixture(scope="session")
+def minimal_splits(parsed_minimal: HomebankFile) -> list[Transaction]:
+    """Splittransaktionen der minimal.xhb, einmal pro Sitzung gefiltert."""
+    return [t for t in parsed_minimal.transactions if t.is_split]
+
+
+@pytest.fixture(scope="session")
+def minimal_internals(parsed_minimal: HomebankFile) -> list[Transaction]:
+    """Interne Überweisungen der minimal.xhb, einmal pro Sitzung gefiltert."""
+    return [t for t in parsed_minimal.transactions if t.is_internal_transfer]
+
+
+@pytest.fixture(scope="session")
+def converted_minimal(parsed_minimal: HomebankFile) -> list[HledgerJournal]:
+    """Einmal pro Sitzung konvertierte Journale der minimal.xhb (nur lesend)."""
+    return convert(parsed_minimal)
+
+
+@pytest.fixture(scope="class")
+def hledger_tree(
+    tmp_path_factory: pytest.TempPathFactory,
+    converted_minimal: list[HledgerJournal],
+) -> Path:
+    """
+    Verzeichnis mit den von write_journals() geschriebenen Journalen der minimal.xhb.
+
+    Wird pro Testklasse einmal geschrieben; die hledger-Aufrufe lesen nur.
+    """
+    # Ohne Journale schriebe write_journals keine main.journal
+    assert converted_minimal, "minimal.xhb ergab keine Journale"
+    output_dir = tmp_path_factory.mktemp("hledger")
+    write_journals(converted_minimal, output_dir)
+    return output_dir
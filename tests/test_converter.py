@@ -2,12 +2,12 @@
 
 from datetime import date
 from decimal import Decimal
-from pathlib import Path
 
 from src.converter import (
     calculate_balances_up_to,
     convert,
     hledger_account_name,
+    iter_journals,
 )
 from src.models import (
     ACCOUNT_TYPE_BANK,
@@ -16,10 +16,24 @@ from src.models import (
     ACCOUNT_TYPE_SAVINGS,
     Account,
     HomebankFile,
+    Transaction,
 )
 from src.parser import parse_xhb
+from tests._helpers import MINIMAL_XHB
 
-FIXTURES = Path(__file__).parent / "fixtures"
+
+def _buchung(hb: HomebankFile, datum: date, betrag: str, konto: int = 1) -> None:
+    """Hängt eine einfache Buchung nachträglich an hb.transactions an."""
+    hb.transactions.append(
+        Transaction(
+            date=datum,
+            amount=Decimal(betrag),
+            account_key=konto,
+            flags=0,
+            status=0,
+            paymode=0,
+        )
+    )
 
 
 class TestHledgerAccountName:
@@ -91,21 +105,50 @@ class TestConvert:
 
     def test_konvertiert_minimale_datei(self) -> None:
         """convert() erzeugt Journale für eine minimale XHB-Datei."""
-        hb = parse_xhb(FIXTURES / "minimal.xhb")
+        hb = parse_xhb(MINIMAL_XHB)
         journals = convert(hb)
         assert len(journals) >= 1
 
     def test_ein_journal_pro_jahr(self) -> None:
         """Für jedes Jahr mit Transaktionen wird ein Journal erstellt."""
-        hb = parse_xhb(FIXTURES / "minimal.xhb")
+        hb = parse_xhb(MINIMAL_XHB)
         journals = convert(hb)
         years = {j.year for j in journals}
         expected_years = {t.date.year for t in hb.transactions}
         assert years == expected_years
 
+    def test_jahre_ohne_transaktionen_werden_uebersprungen(self) -> None:
+        """Lücken zwischen Jahren erzeugen kein leeres Journal."""
+        hb = parse_xhb(MINIMAL_XHB)
+        gap_year = hb.transactions[-1].date.year + 2
+        _buchung(hb, date(gap_year, 3, 1), "-1.00")
+        years = [j.year for j in convert(hb)]
+        assert years == sorted({t.date.year for t in hb.transactions})
+        assert gap_year - 1 not in years
+
+    def test_unsortierte_transaktionen_landen_im_richtigen_jahr(self) -> None:
+        """Nachträglich angehängte frühere Buchungen werden korrekt einsortiert."""
+        hb = parse_xhb(MINIMAL_XHB)
+        last_year = hb.transactions[-1].date.year
+        for year in (last_year + 1, last_year - 1):
+            _buchung(hb, date(year, 6, 1), "-1.00")
+        journals = convert(hb)
+        assert [j.year for j in journals] == [last_year - 1, last_year, last_year + 1]
+        for journal in journals:
+            assert all(t.date.year == journal.year for t in journal.transactions)
+
+    def test_umgekehrte_reihenfolge_erzeugt_alle_jahre(self) -> None:
+        """Absteigend sortierte Transaktionen ergeben trotzdem jedes Jahr."""
+        hb = parse_xhb(MINIMAL_XHB)
+        next_year = hb.transactions[-1].date.year + 1
+        _buchung(hb, date(next_year, 2, 1), "-1.00")
+        hb.transactions.reverse()
+        years = [j.year for j in convert(hb)]
+        assert years == [next_year - 1, next_year]
+
     def test_kein_doppeltes_kxfer(self) -> None:
         """Interne Überweisungen werden nur einmal gebucht (kein kxfer-Duplikat)."""
-        hb = parse_xhb(FIXTURES / "minimal.xhb")
+        hb = parse_xhb(MINIMAL_XHB)
         journals = convert(hb)
         all_txns = [t for j in journals for t in j.transactions]
         # Zwei Seiten der internen Überweisung (kxfer=1) → nur eine Transaktion
@@ -120,7 +163,7 @@ class TestConvert:
 
     def test_ausgabe_erzeugt_kreditoren_konto(self) -> None:
         """Ausgaben mit Payee erzeugen ein Passiva:Kreditoren-Konto."""
-        hb = parse_xhb(FIXTURES / "minimal.xhb")
+        hb = parse_xhb(MINIMAL_XHB)
         journals = convert(hb)
         all_postings = [p for j in journals for t in j.transactions for p in t.postings]
         kreditoren = [p for p in all_postings if "Passiva:Kreditoren:REWE" in p.account]
@@ -128,7 +171,7 @@ class TestConvert:
 
     def test_einnahme_erzeugt_debitoren_konto(self) -> None:
         """Einnahmen mit Payee erzeugen ein Aktiva:Debitoren-Konto."""
-        hb = parse_xhb(FIXTURES / "minimal.xhb")
+        hb = parse_xhb(MINIMAL_XHB)
         journals = convert(hb)
         all_postings = [p for j in journals for t in j.transactions for p in t.postings]
         debitoren = [
@@ -138,7 +181,7 @@ class TestConvert:
 
     def test_split_transaktion_mehrere_postings(self) -> None:
         """Splittransaktionen erzeugen mehrere Posting-Zeilen."""
-        hb = parse_xhb(FIXTURES / "minimal.xhb")
+        hb = parse_xhb(MINIMAL_XHB)
         journals = convert(hb)
         all_txns = [t for j in journals for t in j.transactions]
         # Splittransaktion hat mehr als 2 Postings
@@ -147,7 +190,7 @@ class TestConvert:
 
     def test_eroeffnungsbuchung_ab_zweitem_jahr(self) -> None:
         """Ab dem zweiten Jahr gibt es eine Eröffnungsbuchung."""
-        hb = parse_xhb(FIXTURES / "minimal.xhb")
+        hb = parse_xhb(MINIMAL_XHB)
         journals = convert(hb)
         if len(journals) > 1:
             second_year = sorted(journals, key=lambda j: j.year)[1]
@@ -158,28 +201,35 @@ class TestConvert:
 
     def test_journal_hat_konto_deklarationen(self) -> None:
         """Jedes Journal enthält Konto-Deklarationen."""
-        hb = parse_xhb(FIXTURES / "minimal.xhb")
+        hb = parse_xhb(MINIMAL_XHB)
         journals = convert(hb)
         for j in journals:
             assert len(j.account_declarations) > 0
 
     def test_journal_hat_payee_deklarationen(self) -> None:
         """Jedes Journal enthält Payee-Deklarationen."""
-        hb = parse_xhb(FIXTURES / "minimal.xhb")
+        hb = parse_xhb(MINIMAL_XHB)
         journals = convert(hb)
         for j in journals:
             assert len(j.payee_declarations) > 0
 
+    def test_iter_journals_liefert_dieselben_journale(self) -> None:
+        """iter_journals() erzeugt dieselben Journale wie convert(), nur lazy."""
+        hb = parse_xhb(MINIMAL_XHB)
+        stream = iter_journals(hb)
+        assert not isinstance(stream, list)
+        assert list(stream) == convert(hb)
+
     def test_leere_transaktionsliste(self) -> None:
         """convert() gibt leere Liste zurück, wenn keine Transaktionen vorhanden."""
         hb = HomebankFile(base_currency_key=1)
-        hb.currencies[1] = parse_xhb(FIXTURES / "minimal.xhb").currencies[1]
+        hb.currencies[1] = parse_xhb(MINIMAL_XHB).currencies[1]
         journals = convert(hb)
         assert journals == []
 
     def test_transaktion_status_reconciled(self) -> None:
         """Abgestimmte Transaktionen erhalten den Status '*'."""
-        hb = parse_xhb(FIXTURES / "minimal.xhb")
+        hb = parse_xhb(MINIMAL_XHB)
         journals = convert(hb)
         all_txns = [t for j in journals for t in j.transactions]
         reconciled = [
@@ -189,7 +239,7 @@ class TestConvert:
 
     def test_transaktion_status_cleared(self) -> None:
         """Geprüfte Transaktionen erhalten den Status '!'."""
-        hb = parse_xhb(FIXTURES / "minimal.xhb")
+        hb = parse_xhb(MINIMAL_XHB)
         journals = convert(hb)
         all_txns = [t for j in journals for t in j.transactions]
         cleared = [t for t in all_txns if t.status == "!"]
@@ -201,7 +251,7 @@ class TestCalculateBalances:
 
     def test_nur_anfangssaldo_ohne_transaktionen(self) -> None:
         """Ohne Transaktionen entspricht der Saldo dem Anfangssaldo."""
-        hb = parse_xhb(FIXTURES / "minimal.xhb")
+        hb = parse_xhb(MINIMAL_XHB)
         # Datum vor allen Transaktionen
         early_date = date(2000, 1, 1)
         balances = calculate_balances_up_to(hb, early_date)
@@ -210,7 +260,7 @@ class TestCalculateBalances:
 
     def test_saldo_nach_allen_transaktionen(self) -> None:
         """Nach allen Transaktionen ist der Saldo korrekt berechnet."""
-        hb = parse_xhb(FIXTURES / "minimal.xhb")
+        hb = parse_xhb(MINIMAL_XHB)
         future_date = date(2099, 12, 31)
         balances = calculate_balances_up_to(hb, future_date)
         # Girokonto: 1000 - 50 + 2500 - 89.34 - 200 = 3160.66
@@ -220,6 +270,45 @@ class TestCalculateBalances:
         # Kasse: 100 + 200 (interne Überweisung)
         assert balances[2] == Decimal("100.00") + Decimal("200.00")
 
+    def test_stichtag_ist_inklusive(self) -> None:
+        """Transaktionen am Stichtag werden mitgezählt, am Vortag noch nicht."""
+        hb = parse_xhb(MINIMAL_XHB)
+        first = hb.transactions[0]
+        before = calculate_balances_up_to(hb, date.fromordinal(738520))
+        on_day = calculate_balances_up_to(hb, first.date)
+        assert before[first.account_key] == Decimal("1000.00")
+        assert on_day[first.account_key] == Decimal("1000.00") + first.amount
+
+    def test_eroeffnungssalden_entsprechen_stichtagssalden(self) -> None:
+        """Die Eröffnungsbuchung jedes Jahres entspricht dem Saldo zum Vorjahresende."""
+        hb = parse_xhb(MINIMAL_XHB)
+        for key, amount, year in [
+            (1, "-10.00", 2024),
+            (2, "25.50", 2024),
+            (1, "300.00", 2025),
+        ]:
+            _buchung(hb, date(year, 6, 1), amount, key)
+
+        for journal in convert(hb)[1:]:
+            expected = calculate_balances_up_to(hb, date(journal.year - 1, 12, 31))
+            opening = journal.transactions[0]
+            assert opening.payee == "Eröffnungsbilanz"
+            amounts = [p.amount for p in opening.postings if p.amount is not None]
+            assert amounts == [expected[1], expected[2]]
+
+    def test_eroeffnungssalden_bei_unsortierten_transaktionen(self) -> None:
+        """Eine nachträglich angehängte Vorjahresbuchung fließt in die Eröffnung ein."""
+        hb = parse_xhb(MINIMAL_XHB)
+        first_year = hb.transactions[0].date.year
+        _buchung(hb, date(first_year - 1, 6, 1), "-5.00")
+        journals = convert(hb)
+        assert [j.year for j in journals] == [first_year - 1, first_year]
+        opening = journals[1].transactions[0]
+        assert opening.payee == "Eröffnungsbilanz"
+        amounts = [p.amount for p in opening.postings if p.amount is not None]
+        # Girokonto: 1000 - 5 aus dem Vorjahr; Kasse: unverändert 100
+        assert amounts == [Decimal("995.00"), Decimal("100.00")]
+
 
 class TestBugFixes:
     """Reproduktionstests für bekannte Bugs (T027, T028)."""
@@ -248,7 +337,7 @@ class TestBugFixes:
         hledger parst '; type: A  ; geschlossen' als type-Code 'A  ; geschlossen',
         was einen Fehler ergibt. Korrekt: '; type: A, geschlossen: true'.
         """
-        from src.converter import _add_account_declarations
+        from src.converter import _add_account_declarations, _build_name_tables
         from src.models import ACCOUNT_TYPE_BANK, AF_CLOSED, Account, HledgerJournal
 
         closed_account = Account(
@@ -265,7 +354,7 @@ class TestBugFixes:
         hb.accounts[99] = closed_account
 
         journal = HledgerJournal(year=2024, base_currency_iso="EUR")
-        _add_account_declarations(journal, hb, "EUR")
+        _add_account_declarations(journal, _build_name_tables(hb, "EUR"))
 
         # Finde die Deklaration für das geschlossene Konto
         closed_decls = [d for d in journal.account_declarations if "Altes Konto" in d]
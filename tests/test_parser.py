@@ -1,5 +1,6 @@
 """Tests für den XHB-Parser."""
 
+from collections.abc import Callable
 from datetime import date
 from decimal import Decimal
 from pathlib import Path
@@ -12,102 +13,108 @@ from src.models import (
     ACCOUNT_TYPE_CASH,
     TXN_STATUS_CLEARED,
     TXN_STATUS_RECONCILED,
+    HomebankFile,
+    Transaction,
 )
 from src.parser import parse_xhb
 
-FIXTURES = Path(__file__).parent / "fixtures"
-
 
 class TestParseXhb:
     """Tests für parse_xhb()."""
 
-    def test_parst_minimale_datei(self) -> None:
-        """parse_xhb() liest eine minimale XHB-Datei ohne Fehler."""
-        hb = parse_xhb(FIXTURES / "minimal.xhb")
-        assert hb.base_currency_key == 1
-
-    def test_waehrung_wird_geparst(self) -> None:
-        """Währungen werden korrekt geparst."""
-        hb = parse_xhb(FIXTURES / "minimal.xhb")
-        assert 1 in hb.currencies
-        eur = hb.currencies[1]
-        assert eur.iso == "EUR"
-        assert eur.symbol == "€"
-        assert eur.fraction == 2
-
-    def test_konten_werden_geparst(self) -> None:
-        """Konten werden korrekt geparst."""
-        hb = parse_xhb(FIXTURES / "minimal.xhb")
-        assert len(hb.accounts) == 2
-        girokonto = hb.accounts[1]
-        assert girokonto.name == "Girokonto"
-        assert girokonto.account_type == ACCOUNT_TYPE_BANK
-        assert girokonto.initial_balance == Decimal("1000.00")
-        kasse = hb.accounts[2]
-        assert kasse.account_type == ACCOUNT_TYPE_CASH
-
-    def test_datum_wird_korrekt_dekodiert(self) -> None:
-        """GLib Julian Day wird korrekt in Python-Datum umgewandelt."""
-        hb = parse_xhb(FIXTURES / "minimal.xhb")
-        # date="738521" soll ein gültiges Datum ergeben
-        assert hb.transactions[0].date == date.fromordinal(738521)
-
-    def test_betrag_ist_decimal_kein_float(self) -> None:
-        """Beträge werden als Decimal geparst, nicht als float."""
-        hb = parse_xhb(FIXTURES / "minimal.xhb")
-        assert isinstance(hb.transactions[0].amount, Decimal)
-        assert hb.transactions[0].amount == Decimal("-50.00")
-
-    def test_transaktionen_chronologisch_sortiert(self) -> None:
+    @pytest.mark.parametrize(
+        ("getter", "expected"),
+        [
+            pytest.param(lambda hb: hb.base_currency_key, 1, id="basiswaehrung"),
+            pytest.param(lambda hb: hb.base_currency().iso, "EUR", id="basis_iso"),
+            pytest.param(lambda hb: hb.currencies[1].iso, "EUR", id="waehrung_iso"),
+            pytest.param(lambda hb: hb.currencies[1].symbol, "€", id="symbol"),
+            pytest.param(lambda hb: hb.currencies[1].fraction, 2, id="fraction"),
+            pytest.param(lambda hb: len(hb.accounts), 2, id="anzahl_konten"),
+            pytest.param(lambda hb: hb.accounts[1].name, "Girokonto", id="konto"),
+            pytest.param(
+                lambda hb: hb.accounts[1].account_type,
+                ACCOUNT_TYPE_BANK,
+                id="kontotyp_bank",
+            ),
+            pytest.param(
+                lambda hb: hb.accounts[1].initial_balance,
+                Decimal("1000.00"),
+                id="anfangssaldo",
+            ),
+            pytest.param(
+                lambda hb: hb.accounts[2].account_type,
+                ACCOUNT_TYPE_CASH,
+                id="kontotyp_kasse",
+            ),
+            # date="738521" ist ein GLib Julian Day (= Python-Ordinalzahl)
+            pytest.param(
+                lambda hb: hb.transactions[0].date,
+                date.fromordinal(738521),
+                id="datum_julian_day",
+            ),
+            # Beträge als Decimal, nicht als float
+            pytest.param(
+                lambda hb: type(hb.transactions[0].amount), Decimal, id="betrag_typ"
+            ),
+            pytest.param(
+                lambda hb: hb.transactions[0].amount, Decimal("-50.00"), id="betrag"
+            ),
+            # Erste Transaktion hat st=2
+            pytest.param(
+                lambda hb: hb.transactions[0].status,
+                TXN_STATUS_RECONCILED,
+                id="status_reconciled",
+            ),
+            pytest.param(lambda hb: len(hb.payees), 2, id="anzahl_payees"),
+            pytest.param(lambda hb: hb.payees[1].name, "REWE", id="payee_rewe"),
+            pytest.param(
+                lambda hb: hb.payees[2].name, "Arbeitgeber GmbH", id="payee_gehalt"
+            ),
+            pytest.param(lambda hb: len(hb.categories), 2, id="anzahl_kategorien"),
+            # Lebensmittel = Aufwand, Gehalt = Ertrag
+            pytest.param(lambda hb: hb.categories[1].is_income, False, id="aufwand"),
+            pytest.param(lambda hb: hb.categories[2].is_income, True, id="ertrag"),
+        ],
+    )
+    def test_geparste_felder(
+        self,
+        parsed_minimal: HomebankFile,
+        getter: Callable[[HomebankFile], object],
+        expected: object,
+    ) -> None:
+        """Einzelne Felder der minimal.xhb werden korrekt geparst."""
+        assert getter(parsed_minimal) == expected
+
+    def test_transaktionen_chronologisch_sortiert(
+        self, parsed_minimal: HomebankFile
+    ) -> None:
         """Transaktionen sind nach Datum sortiert."""
-        hb = parse_xhb(FIXTURES / "minimal.xhb")
-        dates = [t.date for t in hb.transactions]
+        dates = [t.date for t in parsed_minimal.transactions]
         assert dates == sorted(dates)
 
-    def test_status_reconciled(self) -> None:
-        """st=2 wird als TXN_STATUS_RECONCILED erkannt."""
-        hb = parse_xhb(FIXTURES / "minimal.xhb")
-        # Erste Transaktion hat st=2
-        assert hb.transactions[0].status == TXN_STATUS_RECONCILED
-
-    def test_status_cleared(self) -> None:
+    def test_status_cleared(self, minimal_splits: list[Transaction]) -> None:
         """st=1 wird als TXN_STATUS_CLEARED erkannt."""
-        hb = parse_xhb(FIXTURES / "minimal.xhb")
         # Dritte Transaktion (split) hat st=1
-        split_txn = next(t for t in hb.transactions if t.is_split)
-        assert split_txn.status == TXN_STATUS_CLEARED
+        assert minimal_splits[0].status == TXN_STATUS_CLEARED
 
-    def test_split_transaktion_wird_erkannt(self) -> None:
+    def test_split_transaktion_wird_erkannt(
+        self, minimal_splits: list[Transaction]
+    ) -> None:
         """Splittransaktionen mit flags=256 werden korrekt geparst."""
-        hb = parse_xhb(FIXTURES / "minimal.xhb")
-        split_txns = [t for t in hb.transactions if t.is_split]
-        assert len(split_txns) == 1
-        split = split_txns[0]
+        assert len(minimal_splits) == 1
+        split = minimal_splits[0]
         assert len(split.splits) == 1
         assert split.splits[0].amount == Decimal("-89.34")
         assert split.splits[0].memo == "Wocheneinkauf"
 
-    def test_interne_ueberweisung_wird_erkannt(self) -> None:
+    def test_interne_ueberweisung_wird_erkannt(
+        self, minimal_internals: list[Transaction]
+    ) -> None:
         """Interne Überweisungen (kxfer) werden korrekt geparst."""
-        hb = parse_xhb(FIXTURES / "minimal.xhb")
-        internal = [t for t in hb.transactions if t.is_internal_transfer]
         # Beide Seiten der Überweisung
-        assert len(internal) == 2
-        assert all(t.kxfer == 1 for t in internal)
-
-    def test_payees_werden_geparst(self) -> None:
-        """Zahlungsempfänger werden korrekt geparst."""
-        hb = parse_xhb(FIXTURES / "minimal.xhb")
-        assert len(hb.payees) == 2
-        assert hb.payees[1].name == "REWE"
-        assert hb.payees[2].name == "Arbeitgeber GmbH"
-
-    def test_kategorien_werden_geparst(self) -> None:
-        """Kategorien werden korrekt geparst."""
-        hb = parse_xhb(FIXTURES / "minimal.xhb")
-        assert len(hb.categories) == 2
-        assert not hb.categories[1].is_income  # Lebensmittel = Aufwand
-        assert hb.categories[2].is_income  # Gehalt = Ertrag
+        assert len(minimal_internals) == 2
+        assert all(t.kxfer == 1 for t in minimal_internals)
 
     def test_datei_nicht_gefunden(self) -> None:
         """FileNotFoundError wird geworfen, wenn Datei nicht existiert."""
@@ -128,9 +135,58 @@ class TestParseXhb:
         with pytest.raises(HomebankParseError, match="Root-Element"):
             parse_xhb(bad_file)
 
-    def test_basiswaehrung_aus_properties(self) -> None:
-        """Die Basiswährung wird aus dem <properties>-Element gelesen."""
-        hb = parse_xhb(FIXTURES / "minimal.xhb")
-        assert hb.base_currency_key == 1
-        base = hb.base_currency()
-        assert base.iso == "EUR"
+    def test_fehlendes_properties_element(self, tmp_path: Path) -> None:
+        """HomebankParseError wird geworfen, wenn <properties> fehlt."""
+        bad_file = tmp_path / "bad.xhb"
+        bad_file.write_text(
+            '<?xml version="1.0"?><homebank><cur key="1" iso="EUR"/></homebank>',
+            encoding="utf-8",
+        )
+        with pytest.raises(HomebankParseError, match="properties"):
+            parse_xhb(bad_file)
+
+    def test_wiederkehrende_texte_teilen_ein_objekt(self, tmp_path: Path) -> None:
+        """Gleiche Buchungstexte werden als dasselbe str-Objekt abgelegt."""
+        xhb = tmp_path / "dup.xhb"
+        xhb.write_text(
+            '<?xml version="1.0"?><homebank><properties curr="1"/>'
+            '<ope date="738521" amount="-1" account="1" wording="Miete"/>'
+            '<ope date="738522" amount="-1" account="1" wording="Miete"/>'
+            "</homebank>",
+            encoding="utf-8",
+        )
+        hb = parse_xhb(xhb)
+        assert hb.transactions[0].wording is hb.transactions[1].wording
+
+    def test_ungueltiger_betrag(self, tmp_path: Path) -> None:
+        """Ein nicht numerischer Betrag führt zu HomebankParseError."""
+        bad_file = tmp_path / "bad.xhb"
+        bad_file.write_text(
+            '<?xml version="1.0"?><homebank><properties curr="1"/>'
+            '<ope date="738521" amount="abc" account="1"/></homebank>',
+            encoding="utf-8",
+        )
+        with pytest.raises(HomebankParseError, match="abc"):
+            parse_xhb(bad_file)
+
+    def test_ungueltiges_datum(self, tmp_path: Path) -> None:
+        """Ein Datum außerhalb des gültigen Bereichs führt zu HomebankParseError."""
+        bad_file = tmp_path / "bad.xhb"
+        bad_file.write_text(
+            '<?xml version="1.0"?><homebank><properties curr="1"/>'
+            '<ope date="0" amount="-1" account="1"/></homebank>',
+            encoding="utf-8",
+        )
+        with pytest.raises(HomebankParseError, match="Datumswert"):
+            parse_xhb(bad_file)
+
+    def test_entitaeten_in_attributen(self, tmp_path: Path) -> None:
+        """XML-Entitäten in Attributwerten werden aufgelöst."""
+        xhb = tmp_path / "ent.xhb"
+        xhb.write_text(
+            '<?xml version="1.0"?><homebank><properties curr="1"/>'
+            '<pay key="1" name="Müller &amp; Söhne"/></homebank>',
+            encoding="utf-8",
+        )
+        hb = parse_xhb(xhb)
+        assert hb.payees[1].name == "Müller & Söhne"
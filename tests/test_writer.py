@@ -4,160 +4,173 @@ from datetime import date
 from decimal import Decimal
 from pathlib import Path
 
+import pytest
+
 from src.models import HledgerJournal, HledgerPosting, HledgerTransaction
-from src.writer import _add_thousands_separator, _format_amount, write_journals
+from src.writer import _format_amount, _render_journal, write_journals
 
 
 class TestFormatAmount:
     """Tests für _format_amount()."""
 
-    def test_positiver_betrag(self) -> None:
-        """Positive Beträge werden korrekt formatiert."""
-        assert _format_amount(Decimal("1234.56"), "EUR") == "1.234,56 EUR"
-
-    def test_negativer_betrag(self) -> None:
-        """Negative Beträge erhalten ein Minuszeichen."""
-        assert _format_amount(Decimal("-89.34"), "EUR") == "-89,34 EUR"
-
-    def test_betrag_ohne_tausender(self) -> None:
-        """Beträge unter 1000 erhalten keinen Tausenderpunkt."""
-        assert _format_amount(Decimal("50.00"), "EUR") == "50,00 EUR"
-
-    def test_grosser_betrag_mit_tausender(self) -> None:
-        """Beträge über 1000 erhalten Tausenderpunkte."""
-        assert _format_amount(Decimal("1000000.00"), "EUR") == "1.000.000,00 EUR"
-
-    def test_fremdwaehrung(self) -> None:
-        """Fremdwährungen werden mit ihrem ISO-Code ausgegeben."""
-        assert _format_amount(Decimal("100.00"), "USD") == "100,00 USD"
-
-    def test_rundung_auf_zwei_stellen(self) -> None:
-        """Beträge werden auf 2 Nachkommastellen gerundet."""
-        assert _format_amount(Decimal("1.999"), "EUR") == "2,00 EUR"
+    @pytest.mark.parametrize(
+        ("value", "currency", "expected"),
+        [
+            pytest.param(Decimal("1234.56"), "EUR", "1.234,56 EUR", id="positiv"),
+            # Negative Beträge erhalten ein Minuszeichen
+            pytest.param(Decimal("-89.34"), "EUR", "-89,34 EUR", id="negativ"),
+            pytest.param(Decimal("50.00"), "EUR", "50,00 EUR", id="ohne_tausender"),
+            pytest.param(
+                Decimal("1000000.00"), "EUR", "1.000.000,00 EUR", id="mit_tausender"
+            ),
+            # Fremdwährungen werden mit ihrem ISO-Code ausgegeben
+            pytest.param(Decimal("100.00"), "USD", "100,00 USD", id="fremdwaehrung"),
+            pytest.param(Decimal("1.999"), "EUR", "2,00 EUR", id="zwei_stellen"),
+            # Exakte Hälften werden zur geraden Ziffer gerundet
+            pytest.param(Decimal("0.125"), "EUR", "0,12 EUR", id="half_even_ab"),
+            pytest.param(Decimal("0.135"), "EUR", "0,14 EUR", id="half_even_auf"),
+            # Auf 0,00 gerundete negative Beträge erhalten kein Minuszeichen
+            pytest.param(Decimal("-0.001"), "EUR", "0,00 EUR", id="negative_null"),
+        ],
+    )
+    def test_format_amount(self, value: Decimal, currency: str, expected: str) -> None:
+        """Beträge werden deutsch formatiert und auf 2 Stellen gerundet."""
+        assert _format_amount(value, currency) == expected
+
+
+class TestTausenderpunkte:
+    """Tests für die Tausendergruppierung in _format_amount()."""
+
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [
+            pytest.param(Decimal("999"), "999,00 EUR", id="unter_1000"),
+            pytest.param(Decimal("1000"), "1.000,00 EUR", id="ein_trenner"),
+            pytest.param(Decimal("-1000000"), "-1.000.000,00 EUR", id="mehrere"),
+        ],
+    )
+    def test_tausenderpunkte(self, value: Decimal, expected: str) -> None:
+        assert _format_amount(value, "EUR") == expected
+
+
+# Einmal konstruierte Beträge für _make_journal (Decimal ist unveränderlich)
+_BETRAG = Decimal("50.00")
+_GEGENBETRAG = Decimal("-50.00")
+
+
+def _make_journal(year: int) -> HledgerJournal:
+    """Erstellt ein minimales Testjournal (bei jedem Aufruf ein neues Objekt)."""
+    journal = HledgerJournal(year=year, base_currency_iso="EUR")
+    journal.account_declarations.append(
+        "account Aktiva:Bank:Girokonto             ; type: C"
+    )
+    journal.payee_declarations.append("REWE")
+    journal.transactions.append(
+        HledgerTransaction(
+            date=date(year, 3, 15),
+            status="*",
+            payee="REWE",
+            note="Einkauf",
+            postings=(
+                HledgerPosting(
+                    account="Aufwand:Lebensmittel",
+                    amount=_BETRAG,
+                    currency="EUR",
+                ),
+                HledgerPosting(
+                    account="Passiva:Kreditoren:REWE",
+                    amount=_GEGENBETRAG,
+                    currency="EUR",
+                ),
+                HledgerPosting(
+                    account="Passiva:Kreditoren:REWE",
+                    amount=_BETRAG,
+                    currency="EUR",
+                ),
+                HledgerPosting(
+                    account="Aktiva:Bank:Girokonto",
+                    amount=_GEGENBETRAG,
+                    currency="EUR",
+                ),
+            ),
+        )
+    )
+    return journal
 
 
-class TestAddThousandsSeparator:
-    """Tests für _add_thousands_separator()."""
+@pytest.fixture(scope="module")
+def rendered_2024() -> str:
+    """Journal-Text für 2024, einmal pro Modul im Speicher erzeugt."""
+    return _render_journal(_make_journal(2024))
 
-    def test_keine_trenner_unter_1000(self) -> None:
-        assert _add_thousands_separator("999") == "999"
 
-    def test_ein_trenner_bei_1000(self) -> None:
-        assert _add_thousands_separator("1000") == "1.000"
+@pytest.fixture(scope="module")
+def written_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """
+    Verzeichnis mit den Journalen 2023/2024, einmal pro Modul geschrieben.
 
-    def test_mehrere_trenner(self) -> None:
-        assert _add_thousands_separator("1000000") == "1.000.000"
+    Nur lesend verwenden; Tests, die selbst schreiben, nutzen tmp_path.
+    """
+    output_dir = tmp_path_factory.mktemp("writer")
+    write_journals([_make_journal(2023), _make_journal(2024)], output_dir)
+    return output_dir
 
 
 class TestWriteJournals:
     """Tests für write_journals()."""
 
-    def _make_journal(self, year: int) -> HledgerJournal:
-        """Erstellt ein minimales Testjournal."""
-        journal = HledgerJournal(year=year, base_currency_iso="EUR")
-        journal.account_declarations.append(
-            "account Aktiva:Bank:Girokonto             ; type: C"
-        )
-        journal.payee_declarations.append("REWE")
-        journal.transactions.append(
-            HledgerTransaction(
-                date=date(year, 3, 15),
-                status="*",
-                payee="REWE",
-                note="Einkauf",
-                postings=(
-                    HledgerPosting(
-                        account="Aufwand:Lebensmittel",
-                        amount=Decimal("50.00"),
-                        currency="EUR",
-                    ),
-                    HledgerPosting(
-                        account="Passiva:Kreditoren:REWE",
-                        amount=Decimal("-50.00"),
-                        currency="EUR",
-                    ),
-                    HledgerPosting(
-                        account="Passiva:Kreditoren:REWE",
-                        amount=Decimal("50.00"),
-                        currency="EUR",
-                    ),
-                    HledgerPosting(
-                        account="Aktiva:Bank:Girokonto",
-                        amount=Decimal("-50.00"),
-                        currency="EUR",
-                    ),
-                ),
-            )
-        )
-        return journal
-
-    def test_erstellt_journal_dateien(self, tmp_path: Path) -> None:
+    def test_erstellt_journal_dateien(self, written_dir: Path) -> None:
         """Für jedes Journal wird eine Datei erstellt."""
-        journals = [self._make_journal(2024), self._make_journal(2023)]
-        write_journals(journals, tmp_path)
-        assert (tmp_path / "2023.journal").exists()
-        assert (tmp_path / "2024.journal").exists()
+        assert (written_dir / "2023.journal").exists()
+        assert (written_dir / "2024.journal").exists()
+
+    def test_datei_entspricht_gerendertem_text(
+        self, written_dir: Path, rendered_2024: str
+    ) -> None:
+        """Die geschriebene Datei ist identisch mit _render_journal()."""
+        content = (written_dir / "2024.journal").read_text(encoding="utf-8")
+        assert content == rendered_2024
 
-    def test_erstellt_main_journal(self, tmp_path: Path) -> None:
+    def test_erstellt_main_journal(self, written_dir: Path) -> None:
         """Die main.journal-Datei wird erstellt."""
-        journals = [self._make_journal(2024)]
-        write_journals(journals, tmp_path)
-        assert (tmp_path / "main.journal").exists()
+        assert (written_dir / "main.journal").exists()
 
-    def test_main_journal_enthaelt_includes(self, tmp_path: Path) -> None:
+    def test_main_journal_enthaelt_includes(self, written_dir: Path) -> None:
         """Die main.journal enthält include-Direktiven."""
-        journals = [self._make_journal(2023), self._make_journal(2024)]
-        write_journals(journals, tmp_path)
-        content = (tmp_path / "main.journal").read_text(encoding="utf-8")
+        content = (written_dir / "main.journal").read_text(encoding="utf-8")
         assert "include 2023.journal" in content
         assert "include 2024.journal" in content
 
-    def test_journal_enthaelt_decimal_mark(self, tmp_path: Path) -> None:
-        """Jede Journal-Datei beginnt mit 'decimal-mark ,'."""
-        journals = [self._make_journal(2024)]
-        write_journals(journals, tmp_path)
-        content = (tmp_path / "2024.journal").read_text(encoding="utf-8")
-        assert "decimal-mark ," in content
-
-    def test_journal_enthaelt_commodity(self, tmp_path: Path) -> None:
-        """Jede Journal-Datei enthält eine commodity-Deklaration."""
-        journals = [self._make_journal(2024)]
-        write_journals(journals, tmp_path)
-        content = (tmp_path / "2024.journal").read_text(encoding="utf-8")
-        assert "commodity" in content
-        assert "EUR" in content
-
-    def test_journal_enthaelt_payee_deklaration(self, tmp_path: Path) -> None:
-        """Payee-Deklarationen erscheinen im Journal."""
-        journals = [self._make_journal(2024)]
-        write_journals(journals, tmp_path)
-        content = (tmp_path / "2024.journal").read_text(encoding="utf-8")
-        assert "payee REWE" in content
-
-    def test_betrag_deutsch_formatiert(self, tmp_path: Path) -> None:
-        """Beträge werden im deutschen Format ausgegeben."""
-        journals = [self._make_journal(2024)]
-        write_journals(journals, tmp_path)
-        content = (tmp_path / "2024.journal").read_text(encoding="utf-8")
-        assert "50,00 EUR" in content
-
     def test_erstellt_ausgabeverzeichnis(self, tmp_path: Path) -> None:
         """Das Ausgabeverzeichnis wird erstellt, falls es nicht existiert."""
         output_dir = tmp_path / "neu" / "verzeichnis"
-        journals = [self._make_journal(2024)]
+        journals = [_make_journal(2024)]
         write_journals(journals, output_dir)
         assert output_dir.exists()
 
-    def test_transaktion_mit_status_stern(self, tmp_path: Path) -> None:
-        """Abgestimmte Transaktionen erhalten '*' in der Ausgabe."""
-        journals = [self._make_journal(2024)]
-        write_journals(journals, tmp_path)
-        content = (tmp_path / "2024.journal").read_text(encoding="utf-8")
-        assert "2024-03-15 * REWE" in content
-
-    def test_payee_pipe_note_format(self, tmp_path: Path) -> None:
-        """Transaktionen mit Payee und Notiz werden als 'Payee | Notiz' ausgegeben."""
-        journals = [self._make_journal(2024)]
-        write_journals(journals, tmp_path)
-        content = (tmp_path / "2024.journal").read_text(encoding="utf-8")
-        assert "REWE | Einkauf" in content
+    def test_gibt_jahre_und_transaktionsanzahl_zurueck(self, tmp_path: Path) -> None:
+        """write_journals() meldet die geschriebenen Jahre und Buchungen."""
+        years, total_txns = write_journals(
+            iter([_make_journal(2023), _make_journal(2024)]), tmp_path
+        )
+        assert years == [2023, 2024]
+        assert total_txns == 2
+
+    def test_ohne_journale_wird_nichts_angelegt(self, tmp_path: Path) -> None:
+        """Ohne Journale entstehen weder Verzeichnis noch main.journal."""
+        output_dir = tmp_path / "leer"
+        assert write_journals([], output_dir) == ([], 0)
+        assert not output_dir.exists()
+
+    def test_journal_enthaelt_erwartete_marker(self, rendered_2024: str) -> None:
+        """Direktiven, Payee-Zeile und Beträge erscheinen im gerenderten Journal."""
+        # Jede Journal-Datei beginnt mit 'decimal-mark ,'
+        assert "decimal-mark ," in rendered_2024, "decimal-mark fehlt"
+        assert "commodity" in rendered_2024, "commodity-Deklaration fehlt"
+        assert "EUR" in rendered_2024, "Währung EUR fehlt"
+        assert "payee REWE" in rendered_2024, "Payee-Deklaration fehlt"
+        # Beträge im deutschen Format
+        assert "50,00 EUR" in rendered_2024, "Betrag nicht deutsch formatiert"
+        # Abgestimmte Transaktionen erhalten '*'
+        assert "2024-03-15 * REWE" in rendered_2024, "Status '*' fehlt"
+        assert "REWE | Einkauf" in rendered_2024, "Format 'Payee | Notiz' fehlt"